@@ -16,18 +16,25 @@ import time
 import logging
 import argparse
 import requests
+from urllib.parse import urlparse
 
 # Update this to use OpenAI or another provider if needed
 DEFAULT_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 DEFAULT_MODEL = "openai/gpt-4-turbo"
 
 class GPTAgent:
-    def __init__(self, name="GPTAgent", api_key=None, model=DEFAULT_MODEL):
+    def __init__(self, name="GPTAgent", api_key=None, model=DEFAULT_MODEL, rate_limiter=None):
+        """
+        rate_limiter: Optional limiter shared with other callers (e.g.
+        python/rate_limiter.py RateLimiter). ask() takes a token per call,
+        keyed by API host, and pauses the bucket on Retry-After.
+        """
         self.name = name
         self.agent_id = str(uuid.uuid4())
         self.running = True
         self.api_key = api_key or os.getenv("OPENROUTER_API_KEY")
         self.model = model
+        self.rate_limiter = rate_limiter
         if not self.api_key:
             raise ValueError("No API key provided. Set OPENROUTER_API_KEY in .env or shell.")
         logging.info(f"[{self.name}] Initialized with ID: {self.agent_id}")
@@ -46,9 +53,16 @@ class GPTAgent:
             ]
         }
 
+        limit_key = urlparse(DEFAULT_API_URL).netloc
+        if self.rate_limiter:
+            self.rate_limiter.acquire(limit_key)
+
         logging.debug(f"Sending prompt to {DEFAULT_API_URL}")
         response = requests.post(DEFAULT_API_URL, headers=headers, json=body)
 
+        if self.rate_limiter:
+            self.rate_limiter.update_from_response(limit_key, response)
+
         if response.status_code == 200:
             result = response.json()
             content = result['choices'][0]['message']['content']
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+benchmark_parallel_analysis.py
+Author: Jeremy Tarkington
+
+Serial vs. parallel column-wise analysis (summarize_dataframe in
+pandas_analyst_agent.py) on synthetic wide frames, across column counts
+and worker counts. Runs fully offline.
+
+Usage:
+    python benchmark_parallel_analysis.py --rows 200000 --columns 20 80 320 --workers 1 2 4 8
+    python benchmark_parallel_analysis.py --output analysis_bench.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from pandas_analyst_agent import summarize_dataframe
+
+
+# ========== Sample Data ==========
+def make_frame(rows, columns, seed=42):
+    """Mix of float, int, low-cardinality text and high-cardinality text columns"""
+    rng = np.random.default_rng(seed)
+    words = np.array([f"value_{i}" for i in range(50)])
+    data = {}
+    for i in range(columns):
+        kind = i % 4
+        if kind == 0:
+            data[f"float_{i}"] = rng.normal(size=rows)
+        elif kind == 1:
+            data[f"int_{i}"] = rng.integers(0, 1_000_000, rows)
+        elif kind == 2:
+            data[f"label_{i}"] = words[rng.integers(0, len(words), rows)]
+        else:
+            data[f"id_{i}"] = rng.integers(0, rows, rows).astype(str)
+    return pd.DataFrame(data)
+
+
+# ========== Benchmark ==========
+def best_of(repeat, func):
+    """Fastest wall time of `repeat` runs (least affected by noise)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(args):
+    results = []
+    for columns in args.columns:
+        df = make_frame(args.rows, columns)
+        serial = best_of(args.repeat, lambda: summarize_dataframe(df))
+        for workers in args.workers:
+            parallel = best_of(args.repeat, lambda: summarize_dataframe(df, parallel=True, workers=workers))
+            results.append({
+                "rows": args.rows,
+                "columns": columns,
+                "workers": workers,
+                "serial_s": round(serial, 4),
+                "parallel_s": round(parallel, 4),
+                "speedup": round(serial / parallel, 2),
+            })
+
+    print(f"\n=== Column-wise analysis ({args.rows} rows, {os.cpu_count()} CPUs) ===")
+    print(f"{'columns':>8}{'workers':>9}{'serial s':>11}{'parallel s':>12}{'speedup':>10}")
+    for r in results:
+        print(f"{r['columns']:>8}{r['workers']:>9}{r['serial_s']:>11.3f}{r['parallel_s']:>12.3f}{r['speedup']:>9.2f}x")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to: {args.output}")
+
+
+def parse_args():
+    cores = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, cores} & set(range(1, cores + 1)))
+    parser = argparse.ArgumentParser(description="Benchmark serial vs parallel DataFrame analysis.")
+    parser.add_argument("--rows", type=int, default=200_000, help="Rows per synthetic frame")
+    parser.add_argument("--columns", type=int, nargs="+", default=[20, 80, 320], help="Column counts to test")
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers, help="Worker counts to test")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    return parser.parse_args()
+
+
+# ========== Entrypoint ==========
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    main(parse_args())
@@ -4,62 +4,821 @@ PandasAnalystAgent Template
 Author: Jeremy Tarkington
 Description:
     A reusable agent that loads a dataset and analyzes structure, completeness,
-    and basic statistics using pandas.
+    and basic statistics using pandas. Reads CSV, Excel, Parquet and Feather
+    (with column projection and batch streaming for the columnar formats).
+    --stream profiles larger-than-RAM files in one chunked pass (exact counts,
+    min/max, mean/std; HyperLogLog distinct counts; KLL quartiles).
+    --cache keeps a Parquet copy and the profile in a sidecar folder: unchanged
+    files skip parsing and appended CSV rows are parsed and merged on their own.
 
 Usage:
     python pandas_analyst_agent.py --file data.csv --verbose
+    python pandas_analyst_agent.py --file events.parquet --columns user value --export subset.feather
+    python pandas_analyst_agent.py --file huge.csv --stream
+    python pandas_analyst_agent.py --file wide.parquet --parallel --workers 8
+    python pandas_analyst_agent.py --file daily_log.csv --stream --cache
 """
 
 import os
+import io
+import json
+import hashlib
 import logging
 import argparse
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa  # pip install pyarrow (only needed for Parquet/Feather and csv_engine="pyarrow")
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+COLUMNAR = {".parquet", ".pq", ".feather", ".arrow"}
+
+
+class HyperLogLog:
+    def __init__(self, precision=14):
+        """
+        Approximate distinct counter in 2**precision one-byte registers
+        (16 KB at the default, about 0.8% standard error).
+        """
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, hashes):
+        """Add a batch of 64-bit hashes (np.uint64)"""
+        if not len(hashes):
+            return
+        bits = 64 - self.precision
+        index = (hashes >> np.uint64(bits)).astype(np.intp)
+        rest = hashes & np.uint64((1 << bits) - 1)
+        # bits < 53, so the float conversion is exact; frexp's exponent is the bit length
+        rank = (bits + 1 - np.frexp(rest.astype(np.float64))[1]).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int32)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)  # Linear counting is more accurate for small sets
+        return int(round(estimate))
+
+
+class QuantileSketch:
+    def __init__(self, k=200, seed=0):
+        """
+        KLL-style mergeable quantile sketch. Keeps O(k log n) values; rank
+        error is roughly 1/k. Level h holds values that each stand for 2**h inputs.
+        """
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            # Sort, keep an odd leftover here, promote every other value (random offset)
+            items = np.sort(items)
+            odd = len(items) % 2
+            promoted = items[odd:][self._rng.integers(2)::2]
+            self.levels[level] = items[:odd]
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level = 0  # Capacities shrink as levels are added
+
+    def quantile(self, q):
+        if not self.count:
+            return np.nan
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(v), 2.0 ** h) for h, v in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        index = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        return float(items[order][min(index, len(items) - 1)])
+
+
+class ColumnProfile:
+    def __init__(self, name):
+        """
+        One-pass accumulator for a column: exact counts, min/max and
+        mean/variance (Welford, merged per chunk), approximate distinct count
+        and quantiles.
+        """
+        self.name = name
+        self.dtypes = []
+        self.count = 0
+        self.nulls = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.numeric_count = 0
+        self.min = None
+        self.max = None
+        self.distinct = HyperLogLog()
+        self.quantiles = QuantileSketch()
+
+    def update(self, series):
+        if series.dtype not in self.dtypes:
+            self.dtypes.append(series.dtype)
+        values = series.dropna()
+        self.count += len(values)
+        self.nulls += len(series) - len(values)
+        if not len(values):
+            return
+
+        numeric = pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+        if numeric:
+            values = values.astype(np.float64)  # 1 and 1.0 must hash the same across chunks
+        self.distinct.update(pd.util.hash_pandas_object(values, index=False).to_numpy())
+        if not numeric:
+            return
+
+        data = values.to_numpy()
+        mean = float(data.mean())
+        self._merge_numeric(len(data), mean, float(((data - mean) ** 2).sum()), float(data.min()), float(data.max()))
+        self.quantiles.update(data)
+
+    def _merge_numeric(self, n, mean, m2, low, high):
+        """Combine running moments with a batch's (parallel form of Welford's update)"""
+        total = self.numeric_count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.numeric_count * n / total
+        self.numeric_count = total
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def merge(self, other):
+        """Fold in another profile of the same column, e.g. of newly appended rows"""
+        self.dtypes.extend(d for d in other.dtypes if d not in self.dtypes)
+        self.count += other.count
+        self.nulls += other.nulls
+        self.distinct.merge(other.distinct)
+        if other.numeric_count:
+            self._merge_numeric(other.numeric_count, other.mean, other.m2, other.min, other.max)
+            self.quantiles.merge(other.quantiles)
+        return self
+
+    def to_state(self, arrays, prefix):
+        """JSON-safe fields; the sketch arrays go into `arrays` under `prefix` (see SidecarCache)"""
+        arrays[f"{prefix}registers"] = self.distinct.registers
+        for level, items in enumerate(self.quantiles.levels):
+            arrays[f"{prefix}level{level}"] = items
+        return {
+            "name": self.name, "dtypes": [str(d) for d in self.dtypes],
+            "count": self.count, "nulls": self.nulls, "mean": self.mean, "m2": self.m2,
+            "numeric_count": self.numeric_count, "min": self.min, "max": self.max,
+            "precision": self.distinct.precision, "k": self.quantiles.k,
+            "sketch_count": self.quantiles.count, "levels": len(self.quantiles.levels),
+            "rng": self.quantiles._rng.bit_generator.state,
+        }
+
+    @classmethod
+    def from_state(cls, state, arrays, prefix):
+        """Inverse of to_state()"""
+        column = cls(state["name"])
+        column.dtypes = [pd.api.types.pandas_dtype(d) for d in state["dtypes"]]
+        for field in ("count", "nulls", "mean", "m2", "numeric_count", "min", "max"):
+            setattr(column, field, state[field])
+        column.distinct = HyperLogLog(state["precision"])
+        column.distinct.registers = arrays[f"{prefix}registers"]
+        column.quantiles = QuantileSketch(state["k"])
+        column.quantiles.count = state["sketch_count"]
+        column.quantiles.levels = [arrays[f"{prefix}level{level}"] for level in range(state["levels"])]
+        column.quantiles._rng.bit_generator.state = state["rng"]
+        return column
+
+    @property
+    def dtype(self):
+        """dtype over all chunks: numeric chunks widen (int + NaN chunk -> float), anything else is object"""
+        if len(self.dtypes) == 1:
+            return self.dtypes[0]
+        if all(isinstance(d, np.dtype) and d.kind in "iuf" for d in self.dtypes):
+            return np.result_type(*self.dtypes)
+        return np.dtype(object)
+
+    @property
+    def is_numeric(self):
+        dtype = self.dtype
+        return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+    def describe(self):
+        """Same fields as DataFrame.describe() for a numeric column"""
+        n = self.numeric_count
+        return {
+            "count": float(n),
+            "mean": self.mean if n else np.nan,
+            "std": float(np.sqrt(self.m2 / (n - 1))) if n > 1 else np.nan,
+            "min": self.min if n else np.nan,
+            "25%": self.quantiles.quantile(0.25),
+            "50%": self.quantiles.quantile(0.50),
+            "75%": self.quantiles.quantile(0.75),
+            "max": self.max if n else np.nan,
+        }
+
+
+class DataProfile:
+    def __init__(self, columns, rows):
+        """
+        Result of PandasAnalystAgent.profile(): the fields analyze() prints.
+        Missing values, min/max, mean and std are exact; unique counts and
+        quartiles are approximate.
+        """
+        self.columns = columns
+        self.rows = rows
+
+    @property
+    def shape(self):
+        return (self.rows, len(self.columns))
+
+    def merge(self, other):
+        """Add another profile's rows (same columns, e.g. an appended tail)"""
+        by_name = {c.name: c for c in self.columns}
+        for column in other.columns:
+            if column.name in by_name:
+                by_name[column.name].merge(column)
+            else:
+                self.columns.append(column)
+        self.rows += other.rows
+        return self
+
+    def select(self, names):
+        """Profile restricted to the given columns"""
+        by_name = {c.name: c for c in self.columns}
+        return DataProfile([by_name[name] for name in names], self.rows)
+
+    @property
+    def dtypes(self):
+        return pd.Series({c.name: c.dtype for c in self.columns}, dtype=object)
+
+    @property
+    def missing(self):
+        return pd.Series({c.name: c.nulls for c in self.columns}, dtype="int64")
+
+    @property
+    def unique(self):
+        return pd.Series({c.name: min(c.distinct.count(), c.count) for c in self.columns}, dtype="int64")
+
+    @property
+    def stats(self):
+        return pd.DataFrame({c.name: c.describe() for c in self.columns if c.is_numeric}).T
+
+    def to_dict(self):
+        return {
+            "shape": self.shape,
+            "dtypes": self.dtypes.astype(str).to_dict(),
+            "missing": self.missing.to_dict(),
+            "unique": self.unique.to_dict(),
+            "stats": self.stats.to_dict(orient="index"),
+        }
+
+    def print_report(self):
+        print("\n=== Dataset Overview (streamed) ===")
+        print(f"Shape: {self.shape}")
+        print("\nColumn Types:\n", self.dtypes)
+        print("\nMissing Values:\n", self.missing)
+        print("\nUnique Values per Column (approx.):\n", self.unique)
+        print("\nBasic Statistics (Numerical, quartiles approx.):\n", self.stats)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} shape={self.shape}>"
+
+
+def profile_batches(batches):
+    """Build a DataProfile from an iterable of DataFrames in one pass"""
+    columns, rows = {}, 0
+    for batch in batches:
+        rows += len(batch)
+        for name in batch.columns:
+            if name not in columns:
+                columns[name] = ColumnProfile(name)
+            columns[name].update(batch[name])
+        logging.debug(f"Profiled {rows} rows so far.")
+    return DataProfile(list(columns.values()), rows)
+
+
+class SidecarCache:
+    VERSION = 2
+    EDGE_BYTES = 64 * 1024   # Bytes hashed at the start and at the old end to detect appends
+    MAX_PARTS = 16           # Appended Parquet parts before they are compacted into one
+
+    def __init__(self, source, cache_dir=None, key="mtime"):
+        """
+        Sidecar cache for one source file: a Parquet copy of the data and
+        its DataProfile. Each is stamped with the source state it was built
+        from, so it is reused while the source is unchanged and only the
+        appended tail is parsed when a CSV grows.
+
+        Args:
+            source (str): Data file
+            cache_dir (str): Where to keep sidecars (default: a ".<name>.cache" folder next to the source)
+            key (str): "mtime" trusts size + mtime; "hash" also requires an identical content hash
+        """
+        self.source = os.path.abspath(source)
+        if cache_dir:
+            digest = hashlib.blake2b(self.source.encode("utf-8"), digest_size=8).hexdigest()
+            self.path = os.path.join(cache_dir, f"{os.path.basename(source)}-{digest}")
+        else:
+            self.path = os.path.join(os.path.dirname(self.source), f".{os.path.basename(source)}.cache")
+        if key not in ("mtime", "hash"):
+            raise ValueError("Cache key must be 'mtime' or 'hash'.")
+        self.key = key
+        self.meta = self._read_meta()
+
+    # --- Source state ---
+    def _hash(self, start=0, end=None):
+        digest = hashlib.blake2b(digest_size=16)
+        with open(self.source, "rb") as f:
+            f.seek(start)
+            remaining = (os.path.getsize(self.source) if end is None else end) - start
+            while remaining > 0:
+                block = f.read(min(remaining, 1 << 20))
+                if not block:
+                    break
+                digest.update(block)
+                remaining -= len(block)
+        return digest.hexdigest()
+
+    def signature(self):
+        """Current source state; take it before reading so later appends aren't missed"""
+        stat = os.stat(self.source)
+        signature = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "head": self._hash(0, min(stat.st_size, self.EDGE_BYTES)),
+            "edge": self._hash(max(0, stat.st_size - self.EDGE_BYTES), stat.st_size),
+        }
+        if self.key == "hash":
+            signature["content"] = self._hash(0, stat.st_size)
+        return signature
+
+    def check(self, product, signature):
+        """Return "hit", "append" (CSV grew; only the tail is new) or "miss" for "frame"/"profile" """
+        stamp = self.meta.get(product)
+        if not stamp:
+            return "miss"
+        if signature["size"] == stamp["size"]:
+            same = (signature["mtime_ns"] == stamp["mtime_ns"] if self.key == "mtime"
+                    else signature["content"] == stamp.get("content"))
+            return "hit" if same else "miss"
+        if self._appended(stamp, signature):
+            return "append"
+        return "miss"
+
+    def _appended(self, stamp, signature):
+        old = stamp["size"]
+        if not self.source.lower().endswith(".csv") or signature["size"] < old or not old:
+            return False
+        if self._hash(0, min(old, self.EDGE_BYTES)) != stamp["head"]:
+            return False
+        if self._hash(max(0, old - self.EDGE_BYTES), old) != stamp["edge"]:
+            return False
+        with open(self.source, "rb") as f:
+            f.seek(old - 1)
+            if f.read(1) != b"\n":
+                return False  # The old last line was incomplete
+        return self.key == "mtime" or self._hash(0, old) == stamp.get("content")
+
+    def read_tail(self, start, end, names, dtypes=None, batch_size=100_000):
+        """Parse CSV rows between byte offsets `start` and `end` in batches"""
+        with open(self.source, "rb") as f:
+            f.seek(start)
+            tail = io.BytesIO(f.read(end - start))
+        yield from pd.read_csv(tail, header=None, names=names, dtype=dtypes, chunksize=batch_size)
+
+    # --- Stored products ---
+    def _read_meta(self):
+        try:
+            with open(os.path.join(self.path, "meta.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return {"version": self.VERSION}
+        return meta if meta.get("version") == self.VERSION else {"version": self.VERSION}
+
+    def stamp(self, product, signature, **extra):
+        """Record the source state `product` now reflects"""
+        self.meta[product] = {**signature, **extra}
+        os.makedirs(self.path, exist_ok=True)
+        tmp = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, indent=2)
+        os.replace(tmp, os.path.join(self.path, "meta.json"))
+
+    def _parts(self):
+        folder = os.path.join(self.path, "frame")
+        if not os.path.isdir(folder):
+            return []
+        return sorted(os.path.join(folder, name) for name in os.listdir(folder) if name.endswith(".parquet"))
+
+    def load_frame(self, columns=None):
+        frames = [pd.read_parquet(part, columns=columns) for part in self._parts()]
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    def write_frame(self, df, append=False):
+        """Store df as the whole Parquet copy, or as one more part of it"""
+        folder = os.path.join(self.path, "frame")
+        os.makedirs(folder, exist_ok=True)
+        parts = self._parts()
+        if not append:
+            for part in parts:
+                os.remove(part)
+            parts = []
+        number = int(os.path.basename(parts[-1])[5:10]) + 1 if parts else 0
+        df.to_parquet(os.path.join(folder, f"part-{number:05d}.parquet"), index=False)
+        if len(parts) + 1 > self.MAX_PARTS:
+            self.write_frame(self.load_frame())
+
+    def load_profile(self):
+        """
+        Read the profile back. It is stored as JSON plus an .npz of the sketch
+        arrays (never pickle), since the default sidecar sits in the data
+        folder and anyone who can write there could otherwise run code here.
+        """
+        with open(os.path.join(self.path, "profile.json"), "r", encoding="utf-8") as f:
+            state = json.load(f)
+        with np.load(os.path.join(self.path, state["arrays"]), allow_pickle=False) as npz:
+            arrays = {name: npz[name] for name in npz.files}
+        columns = [ColumnProfile.from_state(column, arrays, f"{i}.") for i, column in enumerate(state["columns"])]
+        return DataProfile(columns, state["rows"])
+
+    def save_profile(self, profile):
+        os.makedirs(self.path, exist_ok=True)
+        arrays = {}
+        state = {
+            "rows": profile.rows,
+            "columns": [column.to_state(arrays, f"{i}.") for i, column in enumerate(profile.columns)],
+            "arrays": f"profile-{uuid.uuid4().hex[:12]}.npz",  # New name each save; profile.json commits it
+        }
+        with open(os.path.join(self.path, state["arrays"]), "wb") as f:
+            np.savez(f, **arrays)
+        tmp = os.path.join(self.path, "profile.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, os.path.join(self.path, "profile.json"))
+        for name in os.listdir(self.path):
+            if name.startswith("profile") and name.endswith((".npz", ".pkl")) and name != state["arrays"]:
+                os.remove(os.path.join(self.path, name))
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} path={self.path} key={self.key}>"
+
+
+def _describe_columns(df):
+    """Columns DataFrame.describe() covers by default (numeric and datetime, not bool)"""
+    return list(df.select_dtypes(include=[np.number, "datetime"]).columns)
+
+
+def _column_stats(series, describe):
+    return {
+        "missing": int(series.isnull().sum()),
+        "unique": int(series.nunique()),
+        "describe": series.describe() if describe else None,
+    }
+
+
+def _analyze_shared(shm_name, columns, described):
+    """Worker: stats for `columns` of the Arrow IPC table in shared memory (read zero-copy)"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        table = pa.ipc.open_file(pa.py_buffer(shm.buf)).read_all()
+        results = {}
+        for name in columns:
+            series = table.column(name).to_pandas()
+            results[name] = _column_stats(series, name in described)
+            del series
+        del table  # Views into shm.buf must be gone before close()
+        return results
+    finally:
+        shm.close()
+
+
+def _partition(sizes, parts):
+    """Greedy largest-first split of {column: bytes} into `parts` balanced groups"""
+    bins = [[] for _ in range(parts)]
+    loads = [0] * parts
+    for name, size in sorted(sizes.items(), key=lambda item: item[1], reverse=True):
+        target = loads.index(min(loads))
+        bins[target].append(name)
+        loads[target] += size
+    return [group for group in bins if group]
+
+
+def summarize_dataframe(df, parallel=False, workers=None):
+    """
+    Compute the fields analyze() prints: dtypes, missing, unique and stats.
+
+    With parallel=True, columns are split across a process pool. The frame
+    is written once as an Arrow IPC file into shared memory and workers map
+    their columns from it, so column data is never pickled. Columns Arrow
+    can't hold (e.g. mixed-type objects) are computed here instead. The
+    result matches the serial one.
+    """
+    if not parallel:
+        return {
+            "dtypes": df.dtypes,
+            "missing": df.isnull().sum(),
+            "unique": df.nunique(),
+            "stats": df.describe().T,
+        }
+    if pa is None:
+        raise ImportError("Install 'pyarrow' for parallel analysis.")
+
+    described = set(_describe_columns(df))
+    arrays, results = {}, {}
+    for name in df.columns:
+        try:
+            arrays[name] = pa.array(df[name], from_pandas=True)
+        except (pa.ArrowException, TypeError, ValueError):
+            results[name] = _column_stats(df[name], name in described)
+
+    if arrays:
+        table = pa.Table.from_arrays(list(arrays.values()), names=[str(name) for name in arrays])
+        names = dict(zip(table.column_names, arrays))
+        sink = pa.MockOutputStream()
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(1, sink.size()))
+        try:
+            buffer = pa.py_buffer(shm.buf)
+            with pa.ipc.new_file(pa.FixedSizeBufferWriter(buffer), table.schema) as writer:
+                writer.write_table(table)
+            del writer, buffer, table  # Release views of shm.buf
+
+            workers = workers or os.cpu_count() or 1
+            sizes = {name: arrays[names[name]].nbytes for name in names}
+            groups = _partition(sizes, min(len(sizes), workers * 4))  # Extra groups even out slow columns
+            shared_described = {name for name in names if names[name] in described}
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_analyze_shared, shm.name, group, shared_described) for group in groups]
+                for future in futures:
+                    for name, stats in future.result().items():
+                        results[names[name]] = stats
+        finally:
+            shm.close()
+            shm.unlink()
+
+    ordered = [results[name] for name in df.columns]
+    return {
+        "dtypes": df.dtypes,
+        "missing": pd.Series([r["missing"] for r in ordered], index=df.columns, dtype="int64"),
+        "unique": pd.Series([r["unique"] for r in ordered], index=df.columns, dtype="int64"),
+        "stats": _merge_describe(df, results, described),
+    }
+
+
+def _merge_describe(df, results, described):
+    """Assemble per-column describe() results the way DataFrame.describe() does"""
+    columns = [name for name in df.columns if name in described]
+    if not columns:
+        return df.describe().T  # No numeric/datetime columns: pandas describes objects instead
+    ldesc = [results[name]["describe"] for name in columns]
+    rows = []
+    for index in sorted((d.index for d in ldesc), key=len):
+        rows.extend(name for name in index if name not in rows)
+    stats = pd.concat([d.reindex(rows) for d in ldesc], axis=1, ignore_index=True, sort=False)
+    stats.columns = pd.Index(columns)
+    return stats.T
+
 
 class PandasAnalystAgent:
-    def __init__(self, name="PandasAnalystAgent", file_path=None):
+    def __init__(self, name="PandasAnalystAgent", file_path=None, columns=None, csv_engine="c",
+                 cache=False, cache_dir=None, cache_key="mtime"):
+        """
+        Args:
+            name (str): Agent name used in log lines
+            file_path (str): CSV, Excel, Parquet or Feather file
+            columns (list): Only load these columns
+            csv_engine (str): "c" or the multithreaded "pyarrow" CSV parser
+            cache (bool): Keep a Parquet copy and the profile in a sidecar cache (see SidecarCache)
+            cache_dir (str): Sidecar location (implies cache=True)
+            cache_key (str): "mtime" or "hash" change detection
+        """
         self.name = name
         self.agent_id = str(uuid.uuid4())
         self.file_path = file_path
+        self.columns = columns
+        self.csv_engine = csv_engine
         self.df = None
 
         if not self.file_path or not os.path.exists(self.file_path):
             raise FileNotFoundError(f"File not found: {self.file_path}")
+        self.cache = SidecarCache(file_path, cache_dir, cache_key) if cache or cache_dir else None
         logging.info(f"[{self.name}] Initialized with ID: {self.agent_id}")
 
+    def _extension(self, path):
+        ext = os.path.splitext(path)[-1].lower()
+        if ext in COLUMNAR and pa is None:
+            raise ImportError("Install 'pyarrow' to read or write Parquet and Feather files.")
+        return ext
+
     def load_data(self):
-        """Load the dataset from CSV or Excel"""
-        ext = os.path.splitext(self.file_path)[-1].lower()
+        """Load the dataset from CSV, Excel, Parquet or Feather"""
+        ext = self._extension(self.file_path)
         logging.debug(f"Loading data from: {self.file_path}")
 
-        if ext == ".csv":
-            self.df = pd.read_csv(self.file_path)
+        if self.cache is not None and ext not in COLUMNAR:
+            self.df = self._load_cached(ext)
+        elif ext == ".csv":
+            self.df = pd.read_csv(self.file_path, usecols=self.columns, engine=self.csv_engine)
         elif ext in [".xlsx", ".xls"]:
-            self.df = pd.read_excel(self.file_path)
+            self.df = pd.read_excel(self.file_path, usecols=self.columns)
+        elif ext in [".parquet", ".pq"]:
+            self.df = pd.read_parquet(self.file_path, columns=self.columns)
+        elif ext in [".feather", ".arrow"]:
+            self.df = pd.read_feather(self.file_path, columns=self.columns)
         else:
-            raise ValueError("Unsupported file type. Use CSV or Excel.")
+            raise ValueError("Unsupported file type. Use CSV, Excel, Parquet or Feather.")
         logging.info(f"Loaded {len(self.df)} rows and {len(self.df.columns)} columns.")
 
-    def analyze(self):
-        """Print dataset metadata and basic insights"""
+    def _load_cached(self, ext):
+        """Load through the sidecar: Parquet copy if unchanged, parse only the tail if appended"""
+        signature = self.cache.signature()
+        status = self.cache.check("frame", signature)
+
+        if status == "append":
+            stamp = self.cache.meta["frame"]
+            try:
+                tail = pd.concat(self.cache.read_tail(stamp["size"], signature["size"], stamp["columns"],
+                                                      stamp["dtypes"]), ignore_index=True)
+            except (ValueError, TypeError) as e:  # New rows don't fit the cached column types
+                logging.info(f"Cache: appended rows need a full reload ({e}).")
+                status = "miss"
+            else:
+                self.cache.write_frame(tail, append=True)
+                self.cache.stamp("frame", signature, columns=stamp["columns"], dtypes=stamp["dtypes"])
+                logging.info(f"Cache: parsed {len(tail)} appended rows only.")
+
+        if status == "miss":
+            if ext == ".csv":
+                df = pd.read_csv(self.file_path, engine=self.csv_engine)
+            else:
+                df = pd.read_excel(self.file_path)
+            self.cache.write_frame(df)
+            dtypes = {str(name): str(dtype) for name, dtype in df.dtypes.items()}
+            self.cache.stamp("frame", signature, columns=[str(name) for name in df.columns], dtypes=dtypes)
+            logging.info(f"Cache: stored a Parquet copy in {self.cache.path}")
+            return df[self.columns] if self.columns else df
+
+        if status == "hit":
+            logging.info("Cache: source unchanged, reading the Parquet copy.")
+        return self.cache.load_frame(self.columns)
+
+    def iter_batches(self, batch_size=100_000):
+        """
+        Yield the dataset as DataFrames of at most `batch_size` rows without
+        loading it whole. Parquet streams across row groups; Feather reads
+        record batches from a memory map.
+        """
+        return self._iter_file(batch_size, self.columns)
+
+    def _iter_file(self, batch_size, columns):
+        ext = self._extension(self.file_path)
+        if ext == ".csv":
+            if self.csv_engine != "c":
+                logging.debug("The pyarrow CSV engine has no chunked reader; streaming with the C engine.")
+            yield from pd.read_csv(self.file_path, usecols=columns, chunksize=batch_size)
+        elif ext in [".parquet", ".pq"]:
+            for batch in pq.ParquetFile(self.file_path).iter_batches(batch_size=batch_size, columns=columns):
+                yield batch.to_pandas()
+        elif ext in [".feather", ".arrow"]:
+            with pa.memory_map(self.file_path) as source:
+                reader = pa.ipc.open_file(source)
+                for i in range(reader.num_record_batches):
+                    batch = reader.get_batch(i)
+                    if columns:
+                        batch = batch.select(columns)
+                    for offset in range(0, batch.num_rows, batch_size):
+                        yield batch.slice(offset, batch_size).to_pandas()
+        else:
+            raise ValueError("Streaming supports CSV, Parquet and Feather.")
+
+    def export(self, path):
+        """Write the loaded dataset as CSV, Parquet or Feather (by extension)"""
         if self.df is None:
             raise RuntimeError("Data not loaded.")
+        ext = self._extension(path)
+
+        if ext == ".csv":
+            self.df.to_csv(path, index=False)
+        elif ext in [".parquet", ".pq"]:
+            self.df.to_parquet(path, index=False)
+        elif ext in [".feather", ".arrow"]:
+            self.df.reset_index(drop=True).to_feather(path)
+        else:
+            raise ValueError("Unsupported export type. Use CSV, Parquet or Feather.")
+        logging.info(f"Exported {len(self.df)} rows to: {path}")
+
+    def summarize(self, parallel=False, workers=None):
+        """Return dtypes, missing, unique and stats for the loaded data"""
+        if self.df is None:
+            raise RuntimeError("Data not loaded.")
+        return summarize_dataframe(self.df, parallel=parallel, workers=workers)
+
+    def analyze(self, parallel=False, workers=None):
+        """Print dataset metadata and basic insights (columns split across processes if parallel)"""
+        summary = self.summarize(parallel=parallel, workers=workers)
 
         print("\n=== Dataset Overview ===")
         print(f"Shape: {self.df.shape}")
-        print("\nColumn Types:\n", self.df.dtypes)
+        print("\nColumn Types:\n", summary["dtypes"])
+
+        print("\nMissing Values:\n", summary["missing"])
+
+        print("\nUnique Values per Column:\n", summary["unique"])
+
+        print("\nBasic Statistics (Numerical):\n", summary["stats"])
+
+    def profile(self, batch_size=100_000):
+        """
+        Single-pass profile of the file, read in batches of `batch_size`
+        rows. Memory stays bounded by one batch plus fixed-size sketches per
+        column, whatever the file size.
+
+        With a cache, an unchanged file returns the stored profile and an
+        appended CSV only profiles the new rows and merges them in.
+
+        Returns:
+            DataProfile
+        """
+        if self.cache is not None:
+            profile = self._cached_profile(batch_size)
+            return profile.select(self.columns) if self.columns else profile
+
+        profile = profile_batches(self.iter_batches(batch_size))
+        logging.info(f"Profiled {profile.rows} rows and {len(profile.columns)} columns in one pass.")
+        return profile
+
+    def _cached_profile(self, batch_size):
+        """Profile of every column, reusing and extending the sidecar copy"""
+        signature = self.cache.signature()
+        status = self.cache.check("profile", signature)
+        if status == "hit":
+            try:
+                profile = self.cache.load_profile()
+                logging.info("Cache: source unchanged, using the stored profile.")
+                return profile
+            except (OSError, ValueError, KeyError) as e:
+                logging.info(f"Cache: stored profile unreadable, profiling again ({e}).")
 
-        print("\nMissing Values:\n", self.df.isnull().sum())
+        profile = None
+        if status == "append":
+            stamp = self.cache.meta["profile"]
+            try:
+                tail = profile_batches(self.cache.read_tail(stamp["size"], signature["size"], stamp["columns"],
+                                                            batch_size=batch_size))
+                profile = self.cache.load_profile().merge(tail)
+                logging.info(f"Cache: profiled {tail.rows} appended rows and merged them in.")
+            except (OSError, ValueError, KeyError) as e:
+                logging.info(f"Cache: appended rows need a full profile ({e}).")
 
-        print("\nUnique Values per Column:\n", self.df.nunique())
+        if profile is None:
+            profile = profile_batches(self._iter_file(batch_size, None))
+            logging.info(f"Profiled {profile.rows} rows and {len(profile.columns)} columns in one pass.")
 
-        print("\nBasic Statistics (Numerical):\n", self.df.describe().T)
+        self.cache.save_profile(profile)
+        self.cache.stamp("profile", signature, columns=[str(c.name) for c in profile.columns])
+        return profile
 
-    def run_once(self):
-        """Perform full data load and analysis"""
+    def run_once(self, stream=False, parallel=False, workers=None):
+        """Perform full data load and analysis, or a streamed profile"""
+        if stream:
+            self.profile().print_report()
+            return
         self.load_data()
-        self.analyze()
+        self.analyze(parallel=parallel, workers=workers)
 
 
 def setup_logging(verbose: bool):
@@ -70,7 +829,19 @@ def setup_logging(verbose: bool):
 def parse_args():
     parser = argparse.ArgumentParser(description="PandasAnalystAgent CLI")
     parser.add_argument("--name", type=str, default="PandasAnalystAgent", help="Agent name")
-    parser.add_argument("--file", type=str, required=True, help="Path to CSV or Excel file")
+    parser.add_argument("--file", type=str, required=True, help="Path to CSV, Excel, Parquet or Feather file")
+    parser.add_argument("--columns", nargs="+", help="Only load these columns")
+    parser.add_argument("--engine", choices=["c", "pyarrow"], default="c", help="CSV parser")
+    parser.add_argument("--export", type=str, help="Also write the loaded data here (.csv/.parquet/.feather)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Profile in one chunked pass with bounded memory (larger-than-RAM files)")
+    parser.add_argument("--parallel", action="store_true", help="Analyze columns across CPU cores")
+    parser.add_argument("--workers", type=int, help="Processes for --parallel (default: CPU count)")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reuse a sidecar Parquet copy and profile; parse only rows appended to a CSV")
+    parser.add_argument("--cache-dir", help="Keep sidecar caches here instead of next to the file")
+    parser.add_argument("--cache-key", choices=["mtime", "hash"], default="mtime",
+                        help="Detect changes by size+mtime (fast) or content hash")
     parser.add_argument("--verbose", action="store_true", help="Enable debug logging")
     return parser.parse_args()
 
@@ -79,8 +850,11 @@ def main():
     args = parse_args()
     setup_logging(args.verbose)
 
-    agent = PandasAnalystAgent(name=args.name, file_path=args.file)
-    agent.run_once()
+    agent = PandasAnalystAgent(name=args.name, file_path=args.file, columns=args.columns, csv_engine=args.engine,
+                               cache=args.cache, cache_dir=args.cache_dir, cache_key=args.cache_key)
+    agent.run_once(stream=args.stream, parallel=args.parallel, workers=args.workers)
+    if args.export and not args.stream:
+        agent.export(args.export)
 
 
 if __name__ == "__main__":
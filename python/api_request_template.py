@@ -6,13 +6,50 @@ Author: Jeremy Tarkington
 Reusable REST API caller with:
 - Base URL + endpoint separation
 - Optional headers + API keys
-- Built-in retry logic
+- Built-in retry logic with jittered backoff, retry budget and circuit breaker
+- Pooled keep-alive connections via a shared ApiClient
+- Concurrent batch calls with a bounded in-flight limit
+- Optional GET response cache with ETag revalidation (see response_cache.py)
+- Prefetching paginated iterators and streaming JSON array parsing
+- Optional client-side rate limiting per host (see rate_limiter.py)
+- Optional coalescing of identical in-flight GETs (see single_flight.py)
 - Logging and error handling
 """
 
 import requests
+import json
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import time
 import logging
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+
+# Sibling modules are optional, so this file still works when copied on its own
+try:
+    import json_backend  # Fastest installed JSON parser
+except ImportError:
+    json_backend = None
+
+try:
+    from json_loader import iter_json_array_stream  # Needed by stream_items()
+except ImportError:
+    iter_json_array_stream = None
+
+try:
+    from retry_decorator import CircuitOpenError, compute_delay, get_circuit_breaker
+except ImportError:
+    class CircuitOpenError(RuntimeError):
+        """Raised instead of calling a dependency whose circuit is open"""
+
+    def compute_delay(attempt, delay, backoff=False, jitter=None):
+        """Exponential backoff with optional full jitter (subset of retry_decorator's)"""
+        value = delay * (2 ** (attempt - 1)) if backoff else delay
+        return random.uniform(0, value) if jitter == "full" else value
+
+    def get_circuit_breaker(name, failure_threshold=5, reset_timeout=30.0):
+        raise ImportError(f"circuit='{name}' needs retry_decorator.py next to this script")
 
 
 # ========== Logging ==========
@@ -23,10 +60,401 @@ logging.basicConfig(
 )
 
 
+DEFAULT_BASE_URL = "https://jsonplaceholder.typicode.com"
+
+
+# ========== API Client ==========
+class ApiClient:
+    def __init__(
+        self,
+        base_url=DEFAULT_BASE_URL,
+        headers=None,
+        pool_connections=10,
+        pool_maxsize=10,
+        keep_alive=True,
+        retries=3,
+        timeout=5,
+        retry_delay=2,
+        cache=None,
+        circuit=None,
+        budget=None,
+        rate_limiter=None,
+        single_flight=None
+    ):
+        """
+        HTTP client that reuses TCP/TLS connections across calls.
+
+        Args:
+            base_url (str): Default base URL for endpoints
+            headers (dict): Headers sent with every request
+            pool_connections (int): Number of hosts to keep pools for
+            pool_maxsize (int): Max open connections per host
+            keep_alive (bool): If False, close the connection after each call
+            retries (int): Default number of attempts per call
+            timeout (int): Default request timeout in seconds
+            retry_delay (float): Base for jittered exponential backoff
+            cache (ResponseCache): Optional cache for GET responses
+            circuit (str | CircuitBreaker): Dependency name or breaker; calls
+                fail fast with CircuitOpenError while it is open
+            budget (RetryBudget): Optional retry budget shared with other callers
+            rate_limiter (RateLimiter): Optional limiter, keyed by request host;
+                Retry-After on 429/503 pauses that host's bucket
+            single_flight (SingleFlight): Optional coalescing of concurrent
+                identical GET/HEAD calls; all callers share one result object
+        """
+        self.base_url = base_url
+        self.retries = retries
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+        self.cache = cache
+        self.breaker = get_circuit_breaker(circuit) if isinstance(circuit, str) else circuit
+        self.budget = budget
+        self.rate_limiter = rate_limiter
+        self.single_flight = single_flight
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        if headers:
+            self.session.headers.update(headers)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def request(
+        self,
+        method="GET",
+        endpoint="/posts/1",
+        headers=None,
+        params=None,
+        payload=None,
+        retries=None,
+        timeout=None,
+        base_url=None
+    ):
+        """
+        Send a request and return the parsed JSON body, or None after max retries.
+        """
+        try:
+            return self._request_with_retries(
+                method, endpoint, headers, params, payload, retries, timeout, base_url
+            )
+        except requests.exceptions.RequestException:
+            logging.error("Max retries reached. Giving up.")
+            return None
+        except CircuitOpenError as e:
+            logging.error(e)
+            return None
+
+    def _request_with_retries(
+        self, method, endpoint, headers, params, payload, retries, timeout, base_url
+    ):
+        """Cache-aware request shared by request() and call_api_many(); raises the last error"""
+        url = f"{(base_url or self.base_url).rstrip('/')}{endpoint}"
+
+        if self.single_flight is not None and method.upper() in ("GET", "HEAD"):
+            sent_headers = {**self.session.headers, **(headers or {})}  # Credentials are part of the key
+            key = self.single_flight.key_for(method, url, params, sent_headers)
+            return self.single_flight.do(
+                key, self._fetch, method, url, endpoint, headers, params, payload, retries, timeout
+            )
+        return self._fetch(method, url, endpoint, headers, params, payload, retries, timeout)
+
+    def _fetch(self, method, url, endpoint, headers, params, payload, retries, timeout):
+        """Serve from cache, revalidate, or send the request and cache the result"""
+        cache_key = cached = None
+        if self.cache is not None and method.upper() == "GET":
+            cache_key = self.cache.key_for(
+                requests.Request("GET", url, params=params).prepare().url,
+                {**self.session.headers, **(headers or {})}
+            )
+            cached, fresh = self.cache.lookup(cache_key)
+            if fresh:
+                logging.debug(f"Cache hit: {cache_key}")
+                return cached["data"]
+            if cached is not None:
+                headers = {**(headers or {}), **self.cache.conditional_headers(cached)}
+
+        data, response = self._send_with_retries(
+            method, url, headers, params, payload, retries, timeout,
+            not_modified_ok=cached is not None
+        )
+        if response.status_code == 304 and cached is not None:
+            logging.info(f"Not modified, using cached body: {url}")
+            return self.cache.revalidated(cache_key, cached, response)
+        if cache_key is not None:
+            self.cache.store(cache_key, endpoint, response, data)
+        return data
+
+    def _send_with_retries(
+        self, method, url, headers, params, payload, retries, timeout,
+        stream=False, not_modified_ok=False
+    ):
+        """
+        Retry loop around session.request(); raises the last error.
+        Returns (parsed JSON, response). The body is left unread when
+        stream=True or the server answers 304 with not_modified_ok.
+        """
+        retries = max(1, self.retries if retries is None else retries)  # Always at least one attempt
+        timeout = self.timeout if timeout is None else timeout
+        if self.budget is not None:
+            self.budget.record_call()
+        limit_key = urlparse(url).netloc
+
+        for attempt in range(1, retries + 1):
+            if self.breaker is not None and not self.breaker.allow():
+                raise CircuitOpenError(f"{url} skipped: circuit '{self.breaker.name}' is open.")
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(limit_key)
+            paused = None
+            try:
+                logging.info(f"[{method}] {url} (Attempt {attempt})")
+
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    json=payload,
+                    timeout=timeout,
+                    stream=stream
+                )
+
+                if response.status_code == 304 and not_modified_ok:
+                    if self.breaker is not None:
+                        self.breaker.record_success()
+                    return None, response
+
+                if self.rate_limiter is not None:
+                    paused = self.rate_limiter.update_from_response(limit_key, response)
+                response.raise_for_status()
+                logging.info(f"Status: {response.status_code}")
+                data = None if stream else _parse_json(response)
+                if self.breaker is not None:
+                    self.breaker.record_success()
+                return data, response
+
+            except requests.exceptions.RequestException as e:
+                logging.warning(f"Attempt {attempt} failed: {e}")
+                if self.breaker is not None:
+                    if _is_dependency_failure(e):
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success()  # The dependency answered; the request was at fault
+                if attempt >= retries:
+                    raise
+                if self.budget is not None and not self.budget.try_acquire_retry():
+                    logging.warning("Retry budget exhausted.")
+                    raise
+                if paused is None:  # Otherwise the paused bucket sets the pace
+                    time.sleep(compute_delay(attempt, self.retry_delay, backoff=True, jitter="full"))
+
+    # ========== Pagination & Streaming ==========
+    def iter_pages(
+        self,
+        endpoint,
+        pagination="link",
+        params=None,
+        headers=None,
+        page_param=None,
+        start=None,
+        page_size=None,
+        limit_param=None,
+        cursor_field="next_cursor",
+        items_field=None,
+        max_pages=None,
+        prefetch=True,
+        retries=None,
+        timeout=None,
+        base_url=None
+    ):
+        """
+        Yield parsed page bodies, following the chosen pagination scheme.
+        The next page is fetched in the background while the caller
+        consumes the current one.
+
+        Args:
+            endpoint (str): First page endpoint
+            pagination (str): "link" (RFC 5988 Link: rel="next"), "page",
+                "offset" or "cursor"
+            params (dict): Query params sent with every page
+            page_param (str): Query param carrying the page number, offset or
+                cursor (default "page", "offset" or "cursor")
+            start (int|str): First page number (1), offset (0) or cursor (None)
+            page_size (int): Items per page; a shorter page ends iteration
+            limit_param (str): Query param to send page_size in (e.g. "limit")
+            cursor_field (str): Dotted path to the next cursor in the body
+            items_field (str): Dotted path to the item list in the body
+                (default: the body itself is the list)
+            max_pages (int): Stop after this many pages
+            prefetch (bool): Fetch the next page while the current is consumed
+
+        Raises:
+            ValueError: On an unknown pagination scheme.
+            requests.exceptions.RequestException: When a page fails after retries.
+        """
+        if pagination not in ("link", "page", "offset", "cursor"):
+            raise ValueError(f"Unknown pagination scheme: {pagination}")
+
+        url = f"{(base_url or self.base_url).rstrip('/')}{endpoint}"
+        params = dict(params or {})
+        page_param = page_param or {"page": "page", "offset": "offset", "cursor": "cursor"}.get(pagination)
+        if page_size and limit_param:
+            params[limit_param] = page_size
+        if pagination == "page":
+            params[page_param] = 1 if start is None else start
+        elif pagination == "offset":
+            params[page_param] = 0 if start is None else start
+        elif pagination == "cursor" and start is not None:
+            params[page_param] = start
+
+        def fetch(call):
+            return self._send_with_retries("GET", call[0], headers, call[1], None, retries, timeout)
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch") if prefetch else None
+        call = (url, params)
+        pending = executor.submit(fetch, call) if executor else None
+        pages = 0
+        try:
+            while call is not None:
+                data, response = pending.result() if pending else fetch(call)
+                pending = None
+                pages += 1
+                items = _dig(data, items_field)
+                if pagination in ("page", "offset") and not items:
+                    return
+
+                next_call = None
+                if max_pages is None or pages < max_pages:
+                    next_call = _next_page_call(
+                        pagination, call, response, data, items, page_param, page_size, cursor_field
+                    )
+                call = next_call
+                if executor and call:
+                    pending = executor.submit(fetch, call)
+                yield data
+        finally:
+            if pending is not None:
+                pending.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    def iter_items(self, endpoint, items_field=None, **page_options):
+        """Yield individual items across all pages (same options as iter_pages)"""
+        for page in self.iter_pages(endpoint, items_field=items_field, **page_options):
+            yield from _dig(page, items_field) or []
+
+    def stream_items(
+        self,
+        endpoint,
+        params=None,
+        headers=None,
+        chunk_size=65536,
+        retries=None,
+        timeout=None,
+        base_url=None
+    ):
+        """
+        Yield elements of one large top-level JSON array response without
+        loading the whole body. Retries cover the connection only; errors
+        after streaming has started propagate to the caller.
+        """
+        if iter_json_array_stream is None:
+            raise ImportError("stream_items() needs json_loader.py next to this script")
+        url = f"{(base_url or self.base_url).rstrip('/')}{endpoint}"
+        _, response = self._send_with_retries(
+            "GET", url, headers, params, None, retries, timeout, stream=True
+        )
+        with response:
+            yield from iter_json_array_stream(
+                response.iter_content(chunk_size=chunk_size), min_read=chunk_size
+            )
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} base_url={self.base_url}>"
+
+
+def _parse_json(response):
+    """Parse a response body with the fast JSON backend, retryable like response.json()"""
+    loads = json_backend.loads if json_backend is not None else json.loads
+    try:
+        return loads(response.content)
+    except ValueError as e:
+        raise requests.exceptions.InvalidJSONError(f"Invalid JSON in response: {e}", response=response) from e
+
+
+def _is_dependency_failure(error):
+    """True for errors that say the dependency is unhealthy: no connection, timeout or a 5xx answer"""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    response = getattr(error, "response", None)
+    return isinstance(error, requests.exceptions.HTTPError) and response is not None and response.status_code >= 500
+
+
+def _dig(data, path):
+    """Follow a dotted key path (e.g. "meta.next") into parsed JSON"""
+    if not path:
+        return data
+    for key in path.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _next_page_call(pagination, call, response, data, items, page_param, page_size, cursor_field):
+    """Work out the (url, params) of the page after `call`, or None at the end"""
+    url, params = call
+    if pagination == "link":
+        next_url = response.links.get("next", {}).get("url")
+        return (next_url, None) if next_url else None
+
+    if pagination == "cursor":
+        cursor = _dig(data, cursor_field)
+        return (url, {**params, page_param: cursor}) if cursor else None
+
+    if page_size and len(items) < page_size:
+        return None
+    step = 1 if pagination == "page" else len(items)
+    return (url, {**params, page_param: params[page_param] + step})
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """Return the shared ApiClient used by call_api, creating it on first use"""
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = ApiClient()
+    return _default_client
+
+
+def set_default_client(client):
+    """Replace the shared ApiClient (e.g. one configured with a cache)"""
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
+
+
 # ========== API Client Logic ==========
 def call_api(
     method="GET",
-    base_url="https://jsonplaceholder.typicode.com",
+    base_url=DEFAULT_BASE_URL,
     endpoint="/posts/1",
     headers=None,
     params=None,
@@ -34,32 +462,78 @@ def call_api(
     retries=3,
     timeout=5
 ):
-    url = f"{base_url.rstrip('/')}{endpoint}"
+    return get_default_client().request(
+        method=method,
+        endpoint=endpoint,
+        headers=headers,
+        params=params,
+        payload=payload,
+        retries=retries,
+        timeout=timeout,
+        base_url=base_url
+    )
+
+
+def _call_api_raising(
+    client,
+    method="GET",
+    base_url=DEFAULT_BASE_URL,
+    endpoint="/posts/1",
+    headers=None,
+    params=None,
+    payload=None,
+    retries=3,
+    timeout=5
+):
+    """Same arguments and defaults as call_api, but raises instead of returning None"""
+    return client._request_with_retries(
+        method, endpoint, headers, params, payload, retries, timeout, base_url
+    )
+
+
+def iter_api_pages(endpoint="/posts", **page_options):
+    """Yield page bodies via the shared client (see ApiClient.iter_pages)"""
+    return get_default_client().iter_pages(endpoint, **page_options)
+
+
+def iter_api_items(endpoint="/posts", **page_options):
+    """Yield items across pages via the shared client (see ApiClient.iter_pages)"""
+    return get_default_client().iter_items(endpoint, **page_options)
 
-    for attempt in range(1, retries + 1):
-        try:
-            logging.info(f"[{method}] {url} (Attempt {attempt})")
-
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=params,
-                json=payload,
-                timeout=timeout
-            )
 
-            response.raise_for_status()
-            logging.info(f"Status: {response.status_code}")
-            return response.json()
+def stream_api_items(endpoint="/posts", **stream_options):
+    """Stream elements of a large JSON array response (see ApiClient.stream_items)"""
+    return get_default_client().stream_items(endpoint, **stream_options)
 
-        except requests.exceptions.RequestException as e:
-            logging.warning(f"Attempt {attempt} failed: {e}")
-            if attempt < retries:
-                time.sleep(2 ** attempt)
-            else:
-                logging.error("Max retries reached. Giving up.")
-                return None
+
+def call_api_many(requests_spec, concurrency=10, client=None):
+    """
+    Run many call_api-style requests concurrently.
+
+    Args:
+        requests_spec (list[dict]): One dict of call_api keyword arguments per call
+        concurrency (int): Max number of requests in flight at once
+        client (ApiClient): Client to use (default shared client). Its
+            pool_maxsize should be >= concurrency to avoid discarding connections.
+
+    Returns:
+        list[dict]: One result per spec, in input order, each with
+        "ok" (bool), "data" (parsed JSON or None), "error" (str or None)
+        and "elapsed" (seconds, including retries).
+    """
+    client = client or get_default_client()
+
+    def run_one(spec):
+        start = time.perf_counter()
+        try:
+            data = _call_api_raising(client, **spec)
+            return {"ok": True, "data": data, "error": None, "elapsed": time.perf_counter() - start}
+        except Exception as e:
+            logging.error(f"Batch item failed: {e}")
+            return {"ok": False, "data": None, "error": str(e), "elapsed": time.perf_counter() - start}
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        return list(executor.map(run_one, requests_spec))
 
 
 # ========== Example Usage ==========
@@ -78,3 +552,29 @@ if __name__ == "__main__":
     if data:
         print("\n=== API Response ===")
         print(data)
+
+    # Reuse one pooled client for many calls against the same host
+    with ApiClient(headers=headers, pool_maxsize=20) as client:
+        for post_id in range(1, 4):
+            post = client.request(endpoint=f"/posts/{post_id}")
+            if post:
+                print(post.get("title"))
+
+    # Cache GETs for 5 minutes; expired entries are revalidated with ETags
+    from response_cache import ResponseCache
+
+    cache = ResponseCache(default_ttl=300, ttls={"/users": 3600})
+    set_default_client(ApiClient(headers=headers, cache=cache))
+    call_api(endpoint="/posts/1")
+    call_api(endpoint="/posts/1")  # Served from cache
+    print(cache.stats())
+
+    # Walk paginated results (jsonplaceholder uses _page/_limit + Link headers)
+    for post in iter_api_items("/posts", pagination="link", params={"_page": 1, "_limit": 25}, max_pages=2):
+        print(post["id"], end=" ")
+    print()
+
+    # Fan out a batch of calls, at most 5 in flight at a time
+    batch = [{"endpoint": f"/posts/{post_id}"} for post_id in range(1, 11)]
+    for result in call_api_many(batch, concurrency=5):
+        print(result["ok"], result["error"] or result["data"].get("id"))
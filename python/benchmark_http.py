@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+benchmark_http.py
+Author: Jeremy Tarkington
+
+Offline benchmark suite for the HTTP path in api_request_template.py:
+- Local stand-in HTTP server with configurable latency, payload size and failure rate
+- Sequential (new connection per call), pooled and concurrent modes
+- Requests/sec, p50/p95/p99 latency, retry overhead and peak memory per mode
+- Per-call overhead of the retry decorator
+- JSON results that can be compared run to run (--output / --compare)
+
+Usage:
+    python benchmark_http.py --requests 500 --latency-ms 5 --failure-rate 0.02 --output run.json
+    python benchmark_http.py --compare run.json
+"""
+
+import argparse
+import json
+import logging
+import platform
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from api_request_template import ApiClient, call_api_many
+from retry_decorator import retry
+
+
+# ========== Local Stand-in Server ==========
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+    # Overridden per server by start_server()
+    latency = 0.0
+    body = b"{}"
+    failure_rate = 0.0
+    rng = random.Random()
+    counter = None
+
+    def do_GET(self):
+        self.counter.increment()
+        if self.latency:
+            time.sleep(self.latency)
+
+        if self.failure_rate and self.rng.random() < self.failure_rate:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+
+class RequestCounter:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def increment(self):
+        with self._lock:
+            self.value += 1
+
+    def reset(self):
+        with self._lock:
+            self.value = 0
+
+
+def start_server(host="127.0.0.1", port=0, latency=0.0, payload_size=64, failure_rate=0.0, seed=None):
+    """
+    Start the stand-in server on a background thread and return it.
+    server.counter.value counts every request the server has handled.
+    """
+    filler = "x" * max(0, payload_size - len('{"id": 1, "data": ""}'))
+    handler = type("ConfiguredStandInHandler", (StandInHandler,), {
+        "latency": latency,
+        "body": json.dumps({"id": 1, "data": filler}).encode("utf-8"),
+        "failure_rate": failure_rate,
+        "rng": random.Random(seed),
+        "counter": RequestCounter(),
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.counter = handler.counter
+    thread = threading.Thread(target=server.serve_forever, name="StandInServer", daemon=True)
+    thread.start()
+    return server
+
+
+# ========== Stats Helpers ==========
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies, ok, elapsed, server_attempts, n):
+    return {
+        "requests": n,
+        "ok": ok,
+        "failed": n - ok,
+        "elapsed_s": round(elapsed, 4),
+        "rps": round(n / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "server_attempts": server_attempts,
+        "retry_overhead": round((server_attempts - n) / n, 4) if n else 0.0,
+    }
+
+
+# ========== Modes ==========
+def run_sequential(client, n):
+    """One request at a time; returns (latencies, ok_count)"""
+    latencies, ok = [], 0
+    for i in range(n):
+        start = time.perf_counter()
+        if client.request(endpoint=f"/posts/{i}") is not None:
+            ok += 1
+        latencies.append(time.perf_counter() - start)
+    return latencies, ok
+
+
+def run_concurrent(client, n, concurrency):
+    """call_api_many with a bounded in-flight limit; returns (latencies, ok_count)"""
+    specs = [{"base_url": client.base_url, "endpoint": f"/posts/{i}", "retries": client.retries}
+             for i in range(n)]
+    results = call_api_many(specs, concurrency=concurrency, client=client)
+    return [r["elapsed"] for r in results], sum(r["ok"] for r in results)
+
+
+def build_modes(base_url, args):
+    """Map mode name -> (client factory, runner)"""
+    common = {"base_url": base_url, "retries": args.retries, "retry_delay": args.retry_delay}
+    return {
+        "sequential": (lambda: ApiClient(keep_alive=False, **common), lambda c: run_sequential(c, args.requests)),
+        "pooled": (lambda: ApiClient(**common), lambda c: run_sequential(c, args.requests)),
+        "concurrent": (
+            lambda: ApiClient(pool_maxsize=args.concurrency, **common),
+            lambda c: run_concurrent(c, args.requests, args.concurrency),
+        ),
+    }
+
+
+def bench_mode(server, make_client, runner, n, measure_memory):
+    """Time one mode, then optionally repeat it under tracemalloc for peak memory"""
+    with make_client() as client:
+        server.counter.reset()
+        start = time.perf_counter()
+        latencies, ok = runner(client)
+        elapsed = time.perf_counter() - start
+        result = summarize(latencies, ok, elapsed, server.counter.value, n)
+
+    if measure_memory:
+        # Separate pass: tracemalloc slows allocation-heavy code and would skew timings
+        with make_client() as client:
+            tracemalloc.start()
+            runner(client)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        result["peak_mem_kb"] = round(peak / 1024, 1)
+    return result
+
+
+def bench_retry_wrapper(calls=100_000):
+    """Per-call cost of @retry on the success path"""
+    def bare():
+        return 1
+
+    wrapped = retry(max_attempts=3, delay=0)(bare)
+
+    timings = {}
+    for name, func in (("bare", bare), ("wrapped", wrapped)):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        timings[name] = (time.perf_counter() - start) / calls * 1e9
+
+    return {
+        "calls": calls,
+        "bare_ns": round(timings["bare"], 1),
+        "wrapped_ns": round(timings["wrapped"], 1),
+        "overhead_ns": round(timings["wrapped"] - timings["bare"], 1),
+    }
+
+
+# ========== Reporting ==========
+def print_report(results):
+    cfg = results["config"]
+    print(f"\n=== HTTP Benchmark ({cfg['requests']} requests, latency {cfg['latency_ms']}ms, "
+          f"payload {cfg['payload_size']}B, failure rate {cfg['failure_rate']}) ===")
+    print(f"{'mode':<12}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'failed':>8}{'retry ovh':>11}{'peak KB':>10}")
+    for mode, r in results["modes"].items():
+        print(f"{mode:<12}{r['rps']:>10.1f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+              f"{r['failed']:>8}{r['retry_overhead']:>10.1%}{r.get('peak_mem_kb', '-'):>10}")
+
+    wrapper = results["retry_wrapper"]
+    print(f"\n@retry overhead: {wrapper['overhead_ns']:.0f} ns/call "
+          f"(bare {wrapper['bare_ns']:.0f} ns, wrapped {wrapper['wrapped_ns']:.0f} ns)")
+
+
+def print_comparison(results, baseline):
+    print("\n=== Change vs. baseline ===")
+    for mode, r in results["modes"].items():
+        base = baseline.get("modes", {}).get(mode)
+        if not base:
+            print(f"{mode:<12} (not in baseline)")
+            continue
+        deltas = []
+        for metric in ("rps", "p50_ms", "p95_ms", "p99_ms"):
+            if base.get(metric):
+                deltas.append(f"{metric} {(r[metric] - base[metric]) / base[metric]:+.1%}")
+        print(f"{mode:<12} " + "  ".join(deltas))
+
+
+# ========== Main ==========
+def main(args):
+    logging.disable(logging.CRITICAL)  # call_api logs every attempt
+
+    server = start_server(
+        latency=args.latency_ms / 1000,
+        payload_size=args.payload_size,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    results = {
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "latency_ms": args.latency_ms,
+            "payload_size": args.payload_size,
+            "failure_rate": args.failure_rate,
+            "retries": args.retries,
+            "retry_delay": args.retry_delay,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "modes": {},
+    }
+
+    try:
+        for mode, (make_client, runner) in build_modes(base_url, args).items():
+            if args.modes and mode not in args.modes:
+                continue
+            results["modes"][mode] = bench_mode(
+                server, make_client, runner, args.requests, not args.no_memory
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+        logging.disable(logging.NOTSET)
+
+    results["retry_wrapper"] = bench_retry_wrapper()
+
+    print_report(results)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            print_comparison(results, json.load(f))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to: {args.output}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite for call_api / ApiClient.")
+    parser.add_argument("-n", "--requests", type=int, default=500, help="Requests per mode")
+    parser.add_argument("--concurrency", type=int, default=16, help="In-flight limit for concurrent mode")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Server-side delay per request")
+    parser.add_argument("--payload-size", type=int, default=64, help="Response body size in bytes")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered 503")
+    parser.add_argument("--retries", type=int, default=3, help="Attempts per request")
+    parser.add_argument("--retry-delay", type=float, default=0.01, help="Backoff base delay in seconds")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the server's failure injection")
+    parser.add_argument("--modes", nargs="+", choices=["sequential", "pooled", "concurrent"],
+                        help="Only run these modes")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    parser.add_argument("--compare", help="Baseline JSON results to compare against")
+    return parser.parse_args()
+
+
+# ========== Entrypoint ==========
+if __name__ == "__main__":
+    try:
+        main(parse_args())
+    except KeyboardInterrupt:
+        sys.exit(1)
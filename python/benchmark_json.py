@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+benchmark_json.py
+Author: Jeremy Tarkington
+
+Load/dump throughput of every installed JSON backend (see json_backend.py)
+on representative payloads: a small config file, a medium API payload and
+a large event dump. Runs fully offline.
+
+Usage:
+    python benchmark_json.py --repeat 5 --output json_bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import time
+
+import json_backend
+from json_loader import load_json, save_json
+
+
+# ========== Sample Data ==========
+def make_config():
+    return {
+        "debug": False,
+        "timeout": 10,
+        "retries": 3,
+        "endpoints": {f"service_{i}": f"https://api.example.com/v1/service_{i}" for i in range(20)},
+        "features": [f"flag_{i}" for i in range(30)],
+    }
+
+
+def make_events(count, seed=42):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "timestamp": 1_700_000_000 + i,
+            "user": f"user_{rng.randint(1, 5000)}",
+            "event": rng.choice(["click", "view", "purchase", "signup"]),
+            "value": round(rng.random() * 100, 4),
+            "tags": rng.sample(["a", "b", "c", "d", "e", "f"], 3),
+            "meta": {"ok": rng.random() > 0.1, "note": None},
+        }
+        for i in range(count)
+    ]
+
+
+SAMPLES = {
+    "config (~1 KB)": make_config,
+    "payload (~1 MB)": lambda: make_events(6_000),
+    "event dump (~25 MB)": lambda: make_events(150_000),
+}
+
+
+# ========== Benchmark ==========
+def best_of(repeat, func):
+    """Fastest wall time of `repeat` runs (least affected by noise)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def quiet_save_json(path, data):
+    with contextlib.redirect_stdout(io.StringIO()):  # save_json prints each save
+        save_json(path, data, indent=None)
+
+
+def bench_backend(backend, data, repeat, tmp_dir):
+    encoded = backend.dumps(data, None)
+    size_mb = len(encoded) / 1_000_000
+    path = os.path.join(tmp_dir, f"{backend.name}.json")
+
+    json_backend.set_backend(backend.name)
+    timings = {
+        "dumps": best_of(repeat, lambda: backend.dumps(data, None)),
+        "loads": best_of(repeat, lambda: backend.loads(encoded)),
+        "save_json": best_of(repeat, lambda: quiet_save_json(path, data)),
+        "load_json": best_of(repeat, lambda: load_json(path)),
+    }
+    return {
+        "size_mb": round(size_mb, 3),
+        **{f"{op}_mb_s": round(size_mb / t, 1) for op, t in timings.items()},
+    }
+
+
+def main(args):
+    backends = [json_backend.load_backend(name) for name in json_backend.available_backends()]
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for sample_name, make in SAMPLES.items():
+            data = make()
+            repeat = args.repeat if "dump" not in sample_name else max(1, args.repeat // 2)
+            results[sample_name] = {
+                backend.name: bench_backend(backend, data, repeat, tmp_dir) for backend in backends
+            }
+
+    json_backend.set_backend()
+
+    for sample_name, by_backend in results.items():
+        print(f"\n=== {sample_name} ===")
+        print(f"{'backend':<10}{'dumps MB/s':>12}{'loads MB/s':>12}{'save_json':>12}{'load_json':>12}")
+        for name, r in by_backend.items():
+            print(f"{name:<10}{r['dumps_mb_s']:>12.1f}{r['loads_mb_s']:>12.1f}"
+                  f"{r['save_json_mb_s']:>12.1f}{r['load_json_mb_s']:>12.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to: {args.output}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark installed JSON backends.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept)")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    return parser.parse_args()
+
+
+# ========== Entrypoint ==========
+if __name__ == "__main__":
+    main(parse_args())
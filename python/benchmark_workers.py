@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+benchmark_workers.py
+Author: Jeremy Tarkington
+
+Thread vs. process mode of threaded_worker.py on CPU-bound, I/O-bound and
+large-payload workloads. The payload case also runs the process pool with
+shared memory disabled to show the cost of pickling big arguments, and the
+I/O case adds the asyncio pool (driven through its sync bridge) with many
+more tasks in flight. A micro-task case measures the per-task metrics
+overhead (thread pool with metrics on vs. off). Runs fully offline.
+
+Usage:
+    python benchmark_workers.py --workers 4 --tasks 64
+    python benchmark_workers.py --payload-mb 8 --output workers_bench.json
+    python benchmark_workers.py --tasks 2000 --async-concurrency 2000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+
+from threaded_worker import AsyncWorkerPool, ProcessWorkerPool, WorkerPool
+
+
+# ========== Workloads ==========
+def cpu_task(n):
+    """Pure-Python arithmetic; holds the GIL the whole time"""
+    total = 0
+    for i in range(n):
+        total += i * i % 7
+    return total
+
+
+def io_task(seconds):
+    """Stands in for a network or disk wait; releases the GIL"""
+    time.sleep(seconds)
+    return seconds
+
+
+async def async_io_task(seconds):
+    """Same wait as io_task, as a coroutine for AsyncWorkerPool"""
+    await asyncio.sleep(seconds)
+    return seconds
+
+
+def micro_task(x):
+    """Near-zero work, so pool and metrics overhead dominate"""
+    return x
+
+
+def payload_task(data):
+    """Touches a large buffer lightly so transfer cost dominates"""
+    return sum(data[::65536])
+
+
+# ========== Benchmark ==========
+def best_of(repeat, func):
+    """Fastest wall time of `repeat` runs (least affected by noise)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def make_pool(mode, args):
+    if mode == "thread":
+        return WorkerPool(args.workers)
+    if mode == "thread-nometrics":
+        return WorkerPool(args.workers, metrics=False)
+    if mode == "process":
+        return ProcessWorkerPool(args.workers)
+    if mode == "async":
+        return AsyncWorkerPool(concurrency=args.async_concurrency)
+    return ProcessWorkerPool(args.workers, shm_threshold=float("inf"))  # "process-pickle"
+
+
+def bench(mode, args, fn, inputs):
+    with make_pool(mode, args) as pool:
+        run = pool.map_sync if mode == "async" else pool.map
+        list(run(fn, inputs[:args.workers]))  # Start the processes before timing
+        seconds = best_of(args.repeat, lambda: list(run(fn, inputs)))
+    return {"seconds": round(seconds, 4), "tasks_per_s": round(len(inputs) / seconds, 1)}
+
+
+def main(args):
+    payload = os.urandom(int(args.payload_mb * 1_000_000))
+    workloads = {
+        "cpu": (cpu_task, [args.cpu_loops] * args.tasks, ["thread", "process"]),
+        "io": (io_task, [args.io_ms / 1000] * args.tasks, ["thread", "process", "async"]),
+        "payload": (payload_task, [payload] * args.tasks, ["thread", "process", "process-pickle"]),
+        "micro": (micro_task, list(range(args.micro_tasks)), ["thread", "thread-nometrics"]),
+    }
+
+    results = {}
+    for name, (fn, inputs, modes) in workloads.items():
+        results[name] = {
+            mode: bench(mode, args, async_io_task if mode == "async" else fn, inputs) for mode in modes
+        }
+
+    print(f"\n=== Worker modes ({args.workers} workers, async concurrency {args.async_concurrency}, "
+          f"{args.tasks} tasks, {os.cpu_count()} CPUs) ===")
+    print(f"{'workload':<10}{'mode':<16}{'seconds':>10}{'tasks/s':>12}")
+    for name, by_mode in results.items():
+        for mode, r in by_mode.items():
+            print(f"{name:<10}{mode:<16}{r['seconds']:>10.3f}{r['tasks_per_s']:>12.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to: {args.output}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark thread, process and asyncio worker pools.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Workers per pool")
+    parser.add_argument("--tasks", type=int, default=32, help="Tasks per workload")
+    parser.add_argument("--async-concurrency", type=int, default=1000, help="In-flight limit of the async pool")
+    parser.add_argument("--cpu-loops", type=int, default=300_000, help="Loop iterations per CPU task")
+    parser.add_argument("--io-ms", type=float, default=20, help="Simulated wait per I/O task")
+    parser.add_argument("--payload-mb", type=float, default=4, help="Size of each payload argument")
+    parser.add_argument("--micro-tasks", type=int, default=50_000, help="Tasks in the metrics overhead case")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    return parser.parse_args()
+
+
+# ========== Entrypoint ==========
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    main(parse_args())
@@ -4,18 +4,45 @@ data_cleaning_template.py
 Author: Jeremy Tarkington
 
 Reusable data cleaning script with:
-- CSV loading
+- CSV, Parquet and Feather input/output picked by file extension
+- Column projection, row-group streaming and the multithreaded pyarrow CSV engine
+- Staged pipeline (normalize, drop_empty, fill, infer_types + your own stages)
+  with per-stage time, rows/cols in and out, and optional tracemalloc peak memory
 - Column normalization
 - Null handling
-- Type conversion
-- Export to cleaned CSV
+- Sample-based type inference (numeric, datetime, boolean, category) with downcasting
+- Export to cleaned CSV, Parquet or Feather
+- Chunked streaming mode (--chunksize) for files bigger than RAM
+- Batch mode: a directory or glob of files cleaned in parallel under a memory budget,
+  with per-file progress, error isolation and an optional merged output
 """
 
 import pandas as pd
 import argparse
+import glob
 import logging
+import shutil
 import sys
 import os
+import time
+import tracemalloc
+from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import pyarrow as pa  # pip install pyarrow (only needed for Parquet/Feather and --engine pyarrow)
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+try:
+    from pandas.tseries.api import guess_datetime_format  # pandas 2.2+
+except ImportError:
+    try:
+        from pandas._libs.tslibs.parsing import guess_datetime_format  # Same function, private before 2.2
+    except ImportError:
+        guess_datetime_format = None
 
 
 # ========== Logging ==========
@@ -27,52 +54,816 @@ logging.basicConfig(
 
 
 # ========== Data Cleaning Steps ==========
-def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
-    logging.info("Starting data cleaning...")
+def normalize_columns(columns: pd.Index) -> pd.Index:
+    """Lowercase, strip, snake_case and drop punctuation from column names"""
+    return columns.str.strip().str.lower().str.replace(" ", "_").str.replace(r"[^\w]", "", regex=True)
 
-    # Normalize column names
-    df.columns = (
-        df.columns.str.strip().str.lower().str.replace(" ", "_").str.replace(r"[^\w]", "", regex=True)
-    )
 
-    # Drop entirely empty columns
-    df.dropna(axis=1, how="all", inplace=True)
+def _log(plan):
+    return logging.info if plan is None else logging.debug  # Quieter per chunk
 
-    # Fill missing values (example: fill with 0 or forward fill)
-    df.fillna(method="ffill", inplace=True)
 
-    # Convert columns to proper dtypes (optional example)
-    for col in df.columns:
-        if df[col].dtype == object:
-            try:
-                df[col] = pd.to_numeric(df[col])
-            except ValueError:
-                continue
+def stage_normalize(df: pd.DataFrame, plan: dict = None) -> pd.DataFrame:
+    """Normalize column names (relabels only, no data is copied)"""
+    df.columns = normalize_columns(df.columns)
+    return df
+
+
+def stage_drop_empty(df: pd.DataFrame, plan: dict = None) -> pd.DataFrame:
+    """Drop entirely empty columns (chunks can't tell locally, so use the plan)"""
+    if plan is None:
+        empty = [col for col in df.columns if df[col].count() == 0]
+    else:
+        empty = [col for col in df.columns if col not in plan["keep_columns"]]
+    for col in empty:
+        del df[col]  # In place; dropna()/df[keep] would build a new frame
+    return df
+
 
-    logging.info("Cleaning complete.")
+def stage_fill(df: pd.DataFrame, plan: dict = None) -> pd.DataFrame:
+    """Forward fill missing values, carrying the last valid value over chunk boundaries"""
+    df.ffill(inplace=True)
+    if plan is not None and len(df):
+        df.fillna(plan["last_valid"], inplace=True)
+        last_row = df.iloc[-1]
+        plan["last_valid"].update(last_row[last_row.notna()].to_dict())
     return df
 
 
+def stage_infer_types(df: pd.DataFrame, plan: dict = None) -> pd.DataFrame:
+    """Classify columns from a sample, convert in bulk and downcast"""
+    df, report = infer_types(df, types=None if plan is None else plan["types"])
+    log_memory_report(report, _log(plan))
+    return df
+
+
+DEFAULT_STAGES = [
+    ("normalize", stage_normalize),
+    ("drop_empty", stage_drop_empty),
+    ("fill", stage_fill),
+    ("infer_types", stage_infer_types),
+]
+
+
+def _reset_traced_peak(owns_tracing):
+    """
+    Start a new tracemalloc peak. Python 3.8 has no reset_peak(), so tracing
+    is restarted instead, but only when the pipeline started it itself;
+    otherwise the peak there also covers earlier allocations.
+    """
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+    elif owns_tracing:
+        tracemalloc.stop()
+        tracemalloc.start()
+
+
+class CleaningPipeline:
+    def __init__(self, stages=None, trace_memory=False):
+        """
+        Ordered, named cleaning stages with per-stage instrumentation.
+        A stage is any function (df, plan) -> df; plan is None for whole
+        frames and the profile_file() plan for chunks. Stages should modify
+        and return the frame they get rather than build a new one.
+
+        Args:
+            stages (list): (name, func) pairs (default: DEFAULT_STAGES)
+            trace_memory (bool): Record each stage's peak allocation with tracemalloc.
+                Adds overhead, so it is off by default.
+        """
+        self.stages = list(DEFAULT_STAGES if stages is None else stages)
+        self.trace_memory = trace_memory
+        self.stats = {}
+
+    def register(self, name, func, before=None, after=None):
+        """Add a stage at the end, or just before/after an existing stage"""
+        names = [stage_name for stage_name, _ in self.stages]
+        if name in names:
+            raise ValueError(f"Stage already registered: {name}")
+        anchor = before or after
+        if anchor and anchor not in names:
+            raise ValueError(f"Unknown stage: {anchor}")
+        index = len(names) if not anchor else names.index(anchor) + (1 if after else 0)
+        self.stages.insert(index, (name, func))
+
+    def remove(self, name):
+        self.stages = [(stage_name, func) for stage_name, func in self.stages if stage_name != name]
+
+    def run(self, df: pd.DataFrame, plan: dict = None) -> pd.DataFrame:
+        """Run every stage in order; stats add up across calls (e.g. chunks)"""
+        started = self.trace_memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            for name, func in self.stages:
+                df = self._run_stage(name, func, df, plan, started)
+        finally:
+            if started:
+                tracemalloc.stop()
+        return df
+
+    def _run_stage(self, name, func, df, plan, owns_tracing=False):
+        rows_in, cols_in = df.shape
+        if self.trace_memory:
+            _reset_traced_peak(owns_tracing)
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+
+        df = func(df, plan)
+
+        elapsed = time.perf_counter() - start
+        stats = self.stats.setdefault(name, {
+            "calls": 0, "seconds": 0.0, "rows_in": 0, "rows_out": 0,
+            "cols_in": cols_in, "cols_out": 0, "peak_bytes": None,
+        })
+        stats["calls"] += 1
+        stats["seconds"] += elapsed
+        stats["rows_in"] += rows_in
+        stats["rows_out"] += df.shape[0]
+        stats["cols_out"] = df.shape[1]
+        if self.trace_memory:
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+            stats["peak_bytes"] = max(stats["peak_bytes"] or 0, peak)
+        return df
+
+    def report(self) -> list:
+        """Per-stage stats as a list of dicts, in stage order"""
+        return [{"stage": name, **self.stats[name]} for name, _ in self.stages if name in self.stats]
+
+    def format_report(self) -> str:
+        lines = [f"{'stage':<14}{'calls':>7}{'time s':>10}{'rows in':>11}{'rows out':>11}"
+                 f"{'cols in':>9}{'cols out':>9}{'peak KB':>11}"]
+        for row in self.report():
+            peak = f"{row['peak_bytes'] / 1024:.1f}" if row["peak_bytes"] is not None else "-"
+            lines.append(f"{row['stage']:<14}{row['calls']:>7}{row['seconds']:>10.4f}{row['rows_in']:>11}"
+                         f"{row['rows_out']:>11}{row['cols_in']:>9}{row['cols_out']:>9}{peak:>11}")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} stages={[name for name, _ in self.stages]}>"
+
+
+def clean_dataframe(df: pd.DataFrame, plan: dict = None, pipeline: CleaningPipeline = None) -> pd.DataFrame:
+    """
+    Clean a whole DataFrame, or one chunk of a file when `plan` is given.
+
+    Args:
+        df (DataFrame): Data (or chunk) to clean. Modified in place.
+        plan (dict): Whole-file decisions from profile_file() for chunked mode.
+            Its "last_valid" entry carries forward-fill values across chunks
+            and is updated in place.
+        pipeline (CleaningPipeline): Stages to run (default: DEFAULT_STAGES)
+    """
+    log = _log(plan)
+    log("Starting data cleaning...")
+    df = (pipeline or CleaningPipeline()).run(df, plan)
+    log("Cleaning complete.")
+    return df
+
+
+def log_stage_report(pipeline: CleaningPipeline):
+    for line in pipeline.format_report().splitlines():
+        logging.info(line)
+
+
+# ========== File I/O ==========
+FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet", ".feather": "feather", ".arrow": "feather"}
+
+
+def file_format(path) -> str:
+    """Return "csv", "parquet" or "feather" based on the file extension"""
+    ext = os.path.splitext(path)[-1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"Unsupported file type: {ext or path}. Use {', '.join(FORMATS)}")
+    if FORMATS[ext] != "csv" and pa is None:
+        raise ImportError("Install 'pyarrow' to read or write Parquet and Feather files.")
+    return FORMATS[ext]
+
+
+def read_table(path, columns=None, engine="c") -> pd.DataFrame:
+    """
+    Load a whole file.
+
+    Args:
+        path (str): .csv, .parquet or .feather file
+        columns (list): Only read these columns (skips the rest on disk for columnar files)
+        engine (str): CSV parser, "c" or the multithreaded "pyarrow"
+    """
+    fmt = file_format(path)
+    if fmt == "parquet":
+        return pd.read_parquet(path, columns=columns)
+    if fmt == "feather":
+        return pd.read_feather(path, columns=columns)
+    if engine == "pyarrow":
+        return pd.read_csv(path, usecols=columns, engine="pyarrow")
+    # low_memory=False infers each column's type from the whole file
+    return pd.read_csv(path, usecols=columns, low_memory=False)
+
+
+def iter_table_chunks(path, chunksize, columns=None, dtype=None):
+    """
+    Yield a file as DataFrames of at most `chunksize` rows. Parquet is read
+    batch by batch across row groups and Feather record batch by record
+    batch from a memory map, so only one chunk is in memory at a time.
+
+    Args:
+        dtype (dict): Per-column dtypes for CSV (ignored for typed formats)
+    """
+    fmt = file_format(path)
+    if fmt == "csv":
+        options = {"dtype": dtype} if dtype else {"low_memory": False}
+        yield from pd.read_csv(path, chunksize=chunksize, usecols=columns, **options)
+    elif fmt == "parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns:
+                    batch = batch.select(columns)
+                for offset in range(0, batch.num_rows, chunksize):
+                    yield batch.slice(offset, chunksize).to_pandas()
+
+
+def write_table(df: pd.DataFrame, path):
+    """Write a whole DataFrame as CSV, Parquet or Feather"""
+    fmt = file_format(path)
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    elif fmt == "feather":
+        df.reset_index(drop=True).to_feather(path)
+    else:
+        df.to_csv(path, index=False)
+
+
+def _stable_schema(schema):
+    """Widen per-chunk types (downcasts, categories, all-null chunks) so every chunk fits one schema"""
+    fields = []
+    for field in schema:
+        dtype = field.type.value_type if pa.types.is_dictionary(field.type) else field.type
+        if pa.types.is_signed_integer(dtype):
+            dtype = pa.int64()
+        elif pa.types.is_unsigned_integer(dtype):
+            dtype = pa.uint64()
+        elif pa.types.is_floating(dtype):
+            dtype = pa.float64()
+        elif pa.types.is_null(dtype) or pa.types.is_large_string(dtype):
+            dtype = pa.string()
+        fields.append(pa.field(field.name, dtype))
+    return pa.schema(fields)
+
+
+class TableWriter:
+    def __init__(self, path):
+        """
+        Append DataFrame chunks to one CSV, Parquet or Feather file. Parquet
+        chunks become row groups and Feather chunks record batches.
+
+        Args:
+            path (str): Output path; the format follows the extension
+        """
+        self.path = path
+        self.format = file_format(path)
+        self.written = 0
+        self._writer = None
+        self._schema = None
+
+    def write(self, df: pd.DataFrame):
+        if self.format == "csv":
+            df.to_csv(self.path, index=False, mode="a" if self.written else "w", header=not self.written)
+        else:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._schema = _stable_schema(table.schema)
+                if self.format == "parquet":
+                    self._writer = pq.ParquetWriter(self.path, self._schema)
+                else:
+                    self._writer = pa.ipc.new_file(self.path, self._schema)
+            self._writer.write_table(table.cast(self._schema))
+        self.written += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} path={self.path} written={self.written}>"
+
+
+# ========== Type Inference ==========
+SAMPLE_SIZE = 1000     # Values looked at per column to classify it
+CATEGORY_RATIO = 0.5   # Text columns with at most this share of distinct values become category
+BOOL_WORDS = {"true": True, "false": False, "yes": True, "no": False, "y": True, "n": False, "t": True, "f": False}
+
+
+def _is_text(series: pd.Series) -> bool:
+    return series.dtype == object or isinstance(series.dtype, pd.StringDtype)
+
+
+def _sample(series: pd.Series, sample_size=SAMPLE_SIZE) -> pd.Series:
+    """Evenly spaced non-null values, so problems late in the column still show up"""
+    sample = series.iloc[::max(1, len(series) // sample_size)].dropna()
+    return sample if len(sample) else series.dropna().head(sample_size)
+
+
+def _is_repetitive(series: pd.Series) -> bool:
+    count = series.count()
+    return count > 0 and series.nunique() <= CATEGORY_RATIO * count
+
+
+COMMON_DATE_FORMATS = [
+    "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d",
+    "%m/%d/%Y %H:%M:%S", "%m/%d/%Y", "%d/%m/%Y", "%d.%m.%Y", "%Y/%m/%d",
+]
+
+
+def _guess_date_format(value):
+    """strftime format of a date string, or None. Without pandas' guesser, tries COMMON_DATE_FORMATS"""
+    if guess_datetime_format is not None:
+        return guess_datetime_format(value)
+    for fmt in COMMON_DATE_FORMATS:
+        try:
+            datetime.strptime(value, fmt)
+            return fmt
+        except ValueError:
+            continue
+    return None
+
+
+def _text_kind(series: pd.Series, sample: pd.Series):
+    """("bool", None), ("datetime", format) or (None, None) for a text column"""
+    if sample.astype(str).str.strip().str.lower().isin(BOOL_WORDS.keys()).all():
+        return "bool", None
+    first = series.loc[series.first_valid_index()]
+    fmt = _guess_date_format(first) if isinstance(first, str) else None
+    if fmt and pd.to_datetime(sample, format=fmt, errors="coerce").notna().all():
+        return "datetime", fmt
+    return None, None
+
+
+def classify_column(series: pd.Series, sample_size=SAMPLE_SIZE, text=True):
+    """
+    Guess a column's kind from a sample of its values.
+
+    Args:
+        series (Series): Column to classify.
+        sample_size (int): Number of values to look at.
+        text (bool): Also look for numbers, booleans and dates stored as text.
+
+    Returns:
+        tuple: (kind, arg) where kind is "numeric", "bool", "datetime",
+        "category" or None, and arg is the datetime format if any.
+    """
+    if series.dtype.kind in "iuf":
+        return "numeric", None
+    if not _is_text(series):
+        return None, None
+
+    sample = _sample(series, sample_size)
+    if text and len(sample):
+        if pd.to_numeric(sample, errors="coerce").notna().all():
+            return "numeric", None
+        kind, arg = _text_kind(series, sample)
+        if kind:
+            return kind, arg
+    return ("category", None) if _is_repetitive(series) else (None, None)
+
+
+def convert_column(series: pd.Series, kind, arg=None):
+    """
+    Convert a whole column in one vectorized call.
+    Returns None if any non-null value does not fit `kind`.
+    """
+    if kind == "numeric":
+        converted = pd.to_numeric(series, errors="coerce")
+    elif kind == "bool":
+        converted = series.astype(str).str.strip().str.lower().map(BOOL_WORDS)
+    elif kind == "datetime":
+        converted = pd.to_datetime(series, format=arg, errors="coerce")
+    elif kind == "category":
+        return series.astype("category")
+    else:
+        return None
+
+    if converted.isna().sum() > series.isna().sum():
+        return None
+    if kind == "numeric":
+        return downcast(converted.astype(arg) if arg else converted)
+    if kind == "bool":
+        return converted.astype("boolean" if converted.isna().any() else bool)
+    return converted
+
+
+def downcast(series: pd.Series) -> pd.Series:
+    """Smallest integer width, or float32 when every value survives the round trip"""
+    if series.dtype.kind in "iu":
+        return pd.to_numeric(series, downcast="integer")
+    if series.dtype.kind == "f" and series.dtype.itemsize > 4:
+        smaller = series.astype("float32")
+        if smaller.astype(series.dtype).equals(series):
+            return smaller
+    return series
+
+
+def infer_types(df: pd.DataFrame, types: dict = None, sample_size=SAMPLE_SIZE):
+    """
+    Classify every column, convert it in bulk and downcast, replacing one
+    column at a time rather than copying the frame.
+
+    Args:
+        df (DataFrame): Data to convert.
+        types (dict): Column -> (kind, arg) decided over the whole file in
+            chunked mode. Other text columns then only become category.
+        sample_size (int): Values sampled per column for classification.
+
+    Returns:
+        tuple: (DataFrame, report) where report lists memory before/after
+        for every converted column.
+    """
+    before = df.memory_usage(deep=True, index=False)
+    kinds = {}
+
+    for col in df.columns:
+        series = df[col]
+        if types is not None and col in types:
+            kind, arg = types[col]
+        else:
+            kind, arg = classify_column(series, sample_size, text=types is None)
+
+        converted = convert_column(series, kind, arg)
+        if converted is None and kind != "category" and _is_text(series) and _is_repetitive(series):
+            kind, converted = "category", series.astype("category")
+        if converted is not None:
+            df[col] = converted
+            kinds[col] = kind
+
+    after = df.memory_usage(deep=True, index=False)
+    report = [
+        {"column": col, "kind": kind, "dtype": str(df[col].dtype),
+         "before": int(before[col]), "after": int(after[col])}
+        for col, kind in kinds.items()
+    ]
+    return df, report
+
+
+def log_memory_report(report, log=logging.info):
+    """Log memory saved per converted column and in total"""
+    for row in report:
+        if row["after"] < row["before"]:
+            log(f"  {row['column']}: {row['kind']} -> {row['dtype']}, "
+                f"{row['before'] / 1024:.1f} KB -> {row['after'] / 1024:.1f} KB")
+    before = sum(row["before"] for row in report)
+    saved = before - sum(row["after"] for row in report)
+    if before:
+        log(f"Type inference saved {saved / 1024:.1f} KB ({saved / before:.0%} of converted columns).")
+
+
+# ========== Chunked Mode ==========
+def _numeric_kind(series: pd.Series):
+    """Return "i" or "f" if every non-null value parses as a number, else None"""
+    try:
+        kind = pd.to_numeric(series.dropna()).dtype.kind
+    except (ValueError, TypeError):
+        return None
+    return kind if kind in "if" else None
+
+
+def profile_file(input_file, chunksize, columns=None) -> dict:
+    """
+    Pre-pass over the file, one chunk at a time, to make the decisions a
+    single chunk can't: which columns are empty everywhere, which dtype each
+    column has over the whole file, and which text columns hold numbers,
+    booleans or dates. Memory use is a few flags per column.
+    """
+    raw_columns = None
+    seen_kinds, has_values, has_nulls, leading_null, text_numeric = {}, {}, {}, {}, {}
+    text_kinds, has_time = {}, {}
+
+    for chunk in iter_table_chunks(input_file, chunksize, columns):
+        if raw_columns is None:
+            raw_columns = list(chunk.columns)
+            leading_null = chunk.iloc[0].isna().to_dict() if len(chunk) else {}
+        for col in raw_columns:
+            series = chunk[col]
+            if series.notna().any():
+                has_values[col] = True
+                kind = series.dtype.kind
+                if kind == "O" and pd.api.types.infer_dtype(series, skipna=True) == "boolean":
+                    kind = "b"  # True/False with gaps parses as object
+                seen_kinds.setdefault(col, set()).add(kind)
+            if series.isna().any():
+                has_nulls[col] = True
+            if col not in text_numeric or text_numeric[col] is not None:
+                kind = series.dtype.kind if series.dtype.kind in "if" else None
+                if _is_text(series):
+                    kind = _numeric_kind(series)
+                if kind is None or col not in text_numeric:
+                    text_numeric[col] = kind
+                elif kind == "f":
+                    text_numeric[col] = "f"
+
+            # Booleans and dates stored as text must parse in every chunk
+            if series.notna().any() and text_kinds.get(col, ()) != (None, None):
+                kind, fmt = text_kinds.get(col) or (
+                    _text_kind(series, _sample(series)) if _is_text(series) else (None, None))
+                converted = convert_column(series, kind, fmt) if kind and _is_text(series) else None
+                text_kinds[col] = (kind, fmt) if converted is not None else (None, None)
+                if kind == "datetime" and converted is not None:
+                    time_of_day = converted - converted.dt.normalize()
+                    has_time[col] = has_time.get(col) or bool(time_of_day.max() > pd.Timedelta(0))
+
+    raw_columns = raw_columns or []
+    names = dict(zip(raw_columns, normalize_columns(pd.Index(raw_columns, dtype=object))))
+
+    # Pin each column's CSV read dtype so every chunk parses like the whole file would
+    read_dtypes = {}
+    for col in raw_columns:
+        kinds = seen_kinds.get(col, set())
+        if not kinds:
+            read_dtypes[col] = "float64"  # Entirely empty; dropped later
+        elif kinds == {"i"} and not has_nulls.get(col):
+            read_dtypes[col] = "int64"
+        elif kinds <= {"i", "f"}:
+            read_dtypes[col] = "float64"
+        elif kinds == {"b"}:
+            read_dtypes[col] = "boolean" if has_nulls.get(col) else "bool"
+        else:
+            read_dtypes[col] = "object"
+
+    # Text columns that convert across the whole file get one final type
+    types, date_formats = {}, {}
+    for col in raw_columns:
+        name = names[col]
+        if read_dtypes[col] == "object" and has_values.get(col) and text_numeric.get(col):
+            float_needed = text_numeric[col] == "f" or leading_null.get(col, False)
+            types[name] = ("numeric", "float64" if float_needed else "int64")
+        elif read_dtypes[col] == "boolean":
+            # Whole-file reads give object True/False/NaN, which to_numeric turns into bool or float
+            types[name] = ("numeric", "float64" if leading_null.get(col, False) else "bool")
+        elif read_dtypes[col] == "object" and text_kinds.get(col, (None, None))[0]:
+            types[name] = text_kinds[col]
+            if has_time.get(col):
+                date_formats[name] = "%Y-%m-%d %H:%M:%S"  # Else chunks without times print dates only
+
+    return {
+        "read_dtypes": read_dtypes,
+        "keep_columns": [names[col] for col in raw_columns if has_values.get(col)],
+        "types": types,
+        "date_formats": date_formats,
+        "last_valid": {},
+    }
+
+
+def clean_file_chunked(input_file, output_file, chunksize, columns=None, pipeline=None):
+    """Stream input -> cleaned output chunk by chunk with bounded memory"""
+    plan = profile_file(input_file, chunksize, columns)
+    logging.info(f"Pre-pass complete: keeping {len(plan['keep_columns'])} columns.")
+
+    with TableWriter(output_file) as writer:
+        chunks = iter_table_chunks(input_file, chunksize, columns, dtype=plan["read_dtypes"])
+        for i, chunk in enumerate(chunks):
+            cleaned = clean_dataframe(chunk, plan=plan, pipeline=pipeline)
+            if writer.format == "csv":
+                for col, fmt in plan["date_formats"].items():
+                    cleaned[col] = cleaned[col].dt.strftime(fmt)
+            writer.write(cleaned)
+            logging.debug(f"Chunk {i + 1}: {writer.written} rows written so far.")
+
+    if writer.written == 0:
+        write_table(pd.DataFrame(columns=plan["keep_columns"]), output_file)
+    return writer.written
+
+
+# ========== Batch Mode ==========
+MEMORY_FACTOR = 5        # In-memory DataFrame size relative to bytes read from disk (rough)
+MERGE_CHUNKSIZE = 100_000
+
+
+def find_inputs(pattern) -> list:
+    """Supported files in a directory, or matching a glob, in sorted order"""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*")
+    paths = glob.glob(pattern, recursive=True)
+    return sorted(p for p in paths if os.path.isfile(p) and os.path.splitext(p)[-1].lower() in FORMATS)
+
+
+def output_paths(inputs, output_dir, output_format=None) -> dict:
+    """Map each input to a path under output_dir, keeping subfolders relative to the inputs' common folder"""
+    base = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in inputs])
+    paths = {}
+    for path in inputs:
+        stem, ext = os.path.splitext(os.path.relpath(os.path.abspath(path), base))
+        paths[path] = os.path.join(output_dir, stem + (f".{output_format}" if output_format else ext))
+    return paths
+
+
+def estimate_memory(path, chunksize=None) -> int:
+    """Rough peak bytes for cleaning one file: whole file, or one chunk when streaming"""
+    size = os.path.getsize(path)
+    fmt = file_format(path)
+    if chunksize and fmt != "feather":  # Feather batches are sized by the writer, not chunksize
+        if fmt == "parquet":
+            rows = pq.ParquetFile(path).metadata.num_rows
+        else:
+            with open(path, "rb") as f:
+                sample = f.read(1 << 20)
+            rows = max(1, sample.count(b"\n")) * size / max(1, len(sample))
+        size = min(size, size / max(1, rows) * chunksize)
+    return int(size * MEMORY_FACTOR)
+
+
+def _quiet_worker():
+    logging.getLogger().setLevel(logging.WARNING)  # The parent reports progress per file
+
+
+def _clean_one(input_file, output_file, chunksize, columns, engine, pipeline):
+    """Worker entry point: clean one file and report, never raise"""
+    start = time.perf_counter()
+    pipeline = pipeline or CleaningPipeline()
+    try:
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        rows = clean_file(input_file, output_file, chunksize, columns, engine, pipeline)
+        return {"input": input_file, "output": output_file, "ok": True, "rows": rows,
+                "error": None, "elapsed": time.perf_counter() - start, "stages": pipeline.report()}
+    except Exception as e:
+        return {"input": input_file, "output": output_file, "ok": False, "rows": 0,
+                "error": f"{type(e).__name__}: {e}", "elapsed": time.perf_counter() - start,
+                "stages": pipeline.report()}
+
+
+def clean_many(inputs, output_dir, chunksize=None, columns=None, engine="c",
+               workers=None, memory_budget=None, output_format=None, pipeline=None) -> list:
+    """
+    Clean many files in parallel worker processes. A file that fails is
+    reported and skipped; the others carry on.
+
+    Args:
+        inputs (list): Input paths
+        output_dir (str): Folder for cleaned files (same relative layout as the inputs)
+        workers (int): Worker processes (default: CPU count)
+        memory_budget (int): Max estimated bytes in flight; larger files wait for room.
+            A file bigger than the whole budget still runs, alone.
+        output_format (str): "csv", "parquet" or "feather" (default: same as each input)
+        pipeline (CleaningPipeline): Stages to run; user stages must be picklable
+            (module-level functions). Each result carries its file's stage report.
+
+    Returns:
+        list: One result dict per input, in input order
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(inputs)))
+    outputs = output_paths(inputs, output_dir, output_format)
+    estimates = {path: estimate_memory(path, chunksize) for path in inputs}
+    pending = sorted(inputs, key=estimates.get, reverse=True)  # Largest first balances the tail
+    running, results, crashes = {}, {}, {}
+    broken = False
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_quiet_worker)
+
+    try:
+        while pending or running:
+            if broken and not running:
+                pool.shutdown()
+                pool = ProcessPoolExecutor(max_workers=workers, initializer=_quiet_worker)
+                broken = False
+
+            in_flight = sum(estimates[path] for path in running.values())
+            for path in [] if broken else list(pending):
+                if len(running) >= workers or any(p in crashes for p in running.values()):
+                    break
+                if running and path in crashes:
+                    continue  # Retries run alone so a crash can't take innocent files down again
+                if running and memory_budget and in_flight + estimates[path] > memory_budget:
+                    continue
+                running[pool.submit(_clean_one, path, outputs[path], chunksize, columns, engine, pipeline)] = path
+                in_flight += estimates[path]
+                pending.remove(path)
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = running.pop(future)
+                try:
+                    result = future.result()
+                except BrokenProcessPool as e:
+                    # A worker died (e.g. killed for memory) and took the pool down with it.
+                    # Everything in flight fails, so retry each file once, alone, in a fresh pool.
+                    broken = True
+                    crashes[path] = crashes.get(path, 0) + 1
+                    if crashes[path] < 2:
+                        pending.append(path)
+                        continue
+                    result = {"input": path, "output": outputs[path], "ok": False, "rows": 0,
+                              "error": f"Worker process died: {e}", "elapsed": 0.0, "stages": []}
+                results[path] = result
+                status = f"{result['rows']} rows" if result["ok"] else f"FAILED ({result['error']})"
+                logging.info(f"[{len(results)}/{len(inputs)}] {path}: {status} in {result['elapsed']:.1f}s")
+    finally:
+        for future in running:
+            future.cancel()  # Drop queued work on error (shutdown's cancel_futures needs 3.9)
+        pool.shutdown()
+
+    return [results[path] for path in inputs]
+
+
+def merge_outputs(paths, merged_path):
+    """
+    Concatenate cleaned files into one, in the given order. CSV into CSV is
+    a byte copy; anything else streams through TableWriter.
+    """
+    header = None
+    if file_format(merged_path) == "csv" and all(file_format(p) == "csv" for p in paths):
+        with open(merged_path, "wb") as out:
+            for path in paths:
+                with open(path, "rb") as f:
+                    first = f.readline()
+                    if header is None:
+                        header = first
+                        out.write(first)
+                    elif first != header:
+                        raise ValueError(f"Columns in {path} differ from {paths[0]}")
+                    shutil.copyfileobj(f, out)
+        return
+
+    with TableWriter(merged_path) as writer:
+        for path in paths:
+            for chunk in iter_table_chunks(path, MERGE_CHUNKSIZE):
+                if header is None:
+                    header = list(chunk.columns)
+                elif list(chunk.columns) != header:
+                    raise ValueError(f"Columns in {path} differ from {paths[0]}")
+                writer.write(chunk)
+
+
 # ========== Main Logic ==========
-def main(input_file, output_file):
-    if not os.path.exists(input_file):
-        logging.error(f"Input file not found: {input_file}")
-        sys.exit(1)
+def clean_file(input_file, output_file, chunksize=None, columns=None, engine="c", pipeline=None):
+    """Clean one file end to end, log the stage report and return the number of rows written"""
+    pipeline = pipeline or CleaningPipeline()
+    if chunksize:
+        if engine != "c":
+            logging.warning("The pyarrow CSV engine reads whole files; using the C engine for chunks.")
+        rows = clean_file_chunked(input_file, output_file, chunksize, columns, pipeline)
+        logging.info(f"Streamed {rows} rows in chunks of {chunksize}.")
+    else:
+        df = read_table(input_file, columns=columns, engine=engine)
+        logging.info(f"Loaded {df.shape[0]} rows and {df.shape[1]} columns.")
+
+        cleaned_df = clean_dataframe(df, pipeline=pipeline)
+        write_table(cleaned_df, output_file)
+        rows = len(cleaned_df)
+
+    log_stage_report(pipeline)
+    return rows
+
+
+def main(input_file, output_file, chunksize=None, columns=None, engine="c",
+         workers=None, memory_budget=None, merge=None, output_format=None, trace_memory=False):
+    pipeline = CleaningPipeline(trace_memory=trace_memory)
+
+    if not os.path.isfile(input_file):
+        inputs = find_inputs(input_file)
+        if not inputs:
+            logging.error(f"No input files found: {input_file}")
+            sys.exit(1)
 
-    df = pd.read_csv(input_file)
-    logging.info(f"Loaded {df.shape[0]} rows and {df.shape[1]} columns.")
+        logging.info(f"Cleaning {len(inputs)} files into: {output_file}")
+        results = clean_many(inputs, output_file, chunksize, columns, engine,
+                             workers, memory_budget, output_format, pipeline)
+        failed = [r for r in results if not r["ok"]]
+        logging.info(f"Done: {len(results) - len(failed)} cleaned, {len(failed)} failed.")
 
-    cleaned_df = clean_dataframe(df)
-    cleaned_df.to_csv(output_file, index=False)
+        if merge:
+            merge_outputs([r["output"] for r in results if r["ok"]], merge)
+            logging.info(f"Merged output written to: {merge}")
+        if failed:
+            sys.exit(1)
+        return
 
+    clean_file(input_file, output_file, chunksize, columns, engine, pipeline)
     logging.info(f"Cleaned data written to: {output_file}")
 
 
 # ========== CLI ==========
 def parse_args():
-    parser = argparse.ArgumentParser(description="Clean a CSV file and export the result.")
-    parser.add_argument("--input", required=True, help="Path to raw CSV")
-    parser.add_argument("--output", required=True, help="Path to save cleaned CSV")
+    parser = argparse.ArgumentParser(description="Clean a CSV, Parquet or Feather file and export the result.")
+    parser.add_argument("--input", required=True,
+                        help="Raw .csv, .parquet or .feather file, or a directory/glob of them")
+    parser.add_argument("--output", required=True,
+                        help="Path to save cleaned data (format by extension), or a directory in batch mode")
+    parser.add_argument("--chunksize", type=int, help="Stream the file in chunks of this many rows")
+    parser.add_argument("--columns", nargs="+", help="Only read these columns")
+    parser.add_argument("--engine", choices=["c", "pyarrow"], default="c", help="CSV parser for whole-file reads")
+    parser.add_argument("--workers", type=int, help="Batch mode: worker processes (default: CPU count)")
+    parser.add_argument("--memory-budget", type=float, help="Batch mode: max estimated MB being cleaned at once")
+    parser.add_argument("--merge", help="Batch mode: also concatenate all cleaned files here, in input order")
+    parser.add_argument("--format", choices=["csv", "parquet", "feather"], help="Batch mode: output format")
+    parser.add_argument("--trace-memory", action="store_true", help="Add peak memory per stage to the report")
     return parser.parse_args()
 
 
@@ -80,7 +871,9 @@ def parse_args():
 if __name__ == "__main__":
     args = parse_args()
     try:
-        main(args.input, args.output)
+        budget = int(args.memory_budget * 1024 * 1024) if args.memory_budget else None
+        main(args.input, args.output, args.chunksize, args.columns, args.engine,
+             args.workers, budget, args.merge, args.format, args.trace_memory)
     except Exception as e:
         logging.exception(f"Unexpected error: {e}")
         sys.exit(1)
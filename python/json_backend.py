@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+json_backend.py
+Author: Jeremy Tarkington
+
+Pluggable JSON serializer used by json_loader.py and api_request_template.py:
+- Auto-selects the fastest installed backend: orjson > msgspec > ujson > json
+- Force one with set_backend("json") or the JSON_BACKEND environment variable
+- loads() accepts str or bytes; dumps() always returns UTF-8 bytes
+- Decode errors from every backend are ValueError subclasses
+- Same results as stdlib json: input only stdlib handles (NaN/Infinity,
+  ints wider than 64 bits) falls back to it instead of failing or changing
+"""
+
+import json
+import logging
+import math
+import os
+
+
+class JsonBackend:
+    def __init__(self, name, loads, dumps):
+        """
+        Args:
+            name (str): Backend name
+            loads (callable): str/bytes -> object
+            dumps (callable): (object, indent) -> bytes
+        """
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} name={self.name}>"
+
+
+# ========== Backend Builders ==========
+def _stdlib_dumps(obj, indent=None):
+    if indent is None:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")  # Compact, like the other backends
+    return json.dumps(obj, indent=indent).encode("utf-8")
+
+
+def _has_non_finite(obj):
+    """True if obj holds a NaN/Infinity float (stdlib writes those; fast backends write null)"""
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def _with_stdlib_fallback(name, fast_loads, fast_dumps):
+    """Wrap a fast backend so anything it rejects or would encode differently goes through stdlib json"""
+    def loads(data):
+        try:
+            return fast_loads(data)
+        except ValueError:
+            return json.loads(data)  # NaN/Infinity literals, wide ints; still raises on really bad JSON
+
+    def dumps(obj, indent=None):
+        try:
+            data = fast_dumps(obj, indent)
+        except (TypeError, ValueError, OverflowError):
+            return _stdlib_dumps(obj, indent)  # e.g. ints wider than 64 bits; raises if stdlib can't either
+        # NaN/Infinity come out as null. A round trip (C speed) rules that out cheaply; only
+        # a mismatch (NaN, or e.g. tuples and int keys) pays for the slower Python scan
+        if b"null" in data and fast_loads(data) != obj and _has_non_finite(obj):
+            return _stdlib_dumps(obj, indent)
+        return data
+
+    return JsonBackend(name, loads, dumps)
+
+
+def _build_json():
+    return JsonBackend("json", json.loads, _stdlib_dumps)
+
+
+def _build_orjson():
+    import orjson
+
+    def dumps(obj, indent=None):
+        if indent not in (None, 2):
+            return _stdlib_dumps(obj, indent)  # orjson only pretty-prints with 2 spaces
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent == 2 else 0)
+        return orjson.dumps(obj, option=option)
+
+    return _with_stdlib_fallback("orjson", orjson.loads, dumps)
+
+
+def _build_msgspec():
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    def dumps(obj, indent=None):
+        data = encoder.encode(obj)
+        return msgspec.json.format(data, indent=indent) if indent else data
+
+    return _with_stdlib_fallback("msgspec", decoder.decode, dumps)
+
+
+def _build_ujson():
+    import ujson
+
+    def dumps(obj, indent=None):
+        return ujson.dumps(obj, indent=indent or 0).encode("utf-8")
+
+    return _with_stdlib_fallback("ujson", ujson.loads, dumps)
+
+
+BUILDERS = {
+    "orjson": _build_orjson,
+    "msgspec": _build_msgspec,
+    "ujson": _build_ujson,
+    "json": _build_json,
+}
+
+_active = None
+
+
+# ========== Selection ==========
+def load_backend(name):
+    """
+    Build a backend by name.
+
+    Raises:
+        ValueError: If the name is unknown.
+        ImportError: If the backend's package is not installed.
+    """
+    if name not in BUILDERS:
+        raise ValueError(f"Unknown JSON backend: {name}. Choose from {', '.join(BUILDERS)}")
+    return BUILDERS[name]()
+
+
+def available_backends():
+    """Return the names of all importable backends, fastest first"""
+    names = []
+    for name in BUILDERS:
+        try:
+            load_backend(name)
+            names.append(name)
+        except ImportError:
+            continue
+    return names
+
+
+def set_backend(name=None):
+    """
+    Select the active backend. With no name, use $JSON_BACKEND if set,
+    otherwise the fastest installed one.
+    """
+    global _active
+    name = name or os.getenv("JSON_BACKEND")
+    _active = load_backend(name) if name else load_backend(available_backends()[0])
+    logging.debug(f"JSON backend: {_active.name}")
+    return _active
+
+
+def get_backend():
+    """Return the active backend, selecting one on first use"""
+    return _active or set_backend()
+
+
+def loads(data):
+    """Parse JSON from str or bytes with the active backend"""
+    return get_backend().loads(data)
+
+
+def dumps(obj, indent=None):
+    """Serialize to UTF-8 JSON bytes with the active backend"""
+    return get_backend().dumps(obj, indent)
+
+
+# === Example ===
+if __name__ == "__main__":
+    print(f"Available: {available_backends()}")
+    print(f"Active: {get_backend().name}")
+    print(dumps({"debug": True, "timeout": 10}, indent=2).decode("utf-8"))
@@ -7,11 +7,132 @@ Reusable JSON file loader with:
 - File existence check
 - JSON decode error handling
 - Optional default fallback
+- Fast serializer backend (orjson/msgspec/ujson when installed, see json_backend.py)
+- Incremental parsing of large JSON arrays from byte chunks
+- Memory-mapped JSON Lines / large-array readers with a byte-offset index
+- gzip / zstd compression picked by file extension (.gz, .zst)
+- Atomic writes (temp file + fsync + rename), compact mode, batched JSON Lines appends
+- mtime-aware in-process cache for frequently re-read config files
 """
 
+import codecs
+import gzip
 import json
+import mmap
 import os
 import logging
+import stat
+import threading
+from array import array
+from collections import OrderedDict
+from types import MappingProxyType
+
+import json_backend
+
+try:
+    import zstandard  # pip install zstandard (only needed for .zst files)
+except ImportError:
+    zstandard = None
+
+
+# ========== Compression ==========
+def _compression_for(filepath):
+    """Return "gzip", "zstd" or None based on the file extension"""
+    ext = os.path.splitext(filepath)[-1].lower()
+    if ext == ".gz":
+        return "gzip"
+    if ext in (".zst", ".zstd"):
+        if zstandard is None:
+            raise ImportError("Install 'zstandard' to read or write .zst files.")
+        return "zstd"
+    return None
+
+
+def _open_reader(filepath):
+    """Open a file for binary reading, decompressing by extension"""
+    compression = _compression_for(filepath)
+    if compression == "gzip":
+        return gzip.open(filepath, 'rb')
+    if compression == "zstd":
+        raw = open(filepath, 'rb')
+        return zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+    return open(filepath, 'rb')
+
+
+def _wrap_writer(raw, filepath):
+    """Wrap an open binary file so writes are compressed by extension"""
+    compression = _compression_for(filepath)
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode='wb')
+    if compression == "zstd":
+        return zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+    return None
+
+
+def _write_bytes(raw, filepath, payload):
+    writer = _wrap_writer(raw, filepath)
+    if writer is None:
+        raw.write(payload)
+    else:
+        with writer:
+            writer.write(payload)
+
+
+def _fsync_dir(path):
+    """Persist a rename by syncing its directory (no-op where unsupported)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _open_temp(filepath, directory):
+    """
+    Create a unique temp file next to filepath. Unlike mkstemp (always 0600),
+    it gets the existing file's mode, or the kernel applies the umask to 0666
+    exactly as for a plain open(), without touching the process-wide umask.
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(filepath).st_mode)
+    except FileNotFoundError:
+        mode = None
+    tmp_path = os.path.join(directory, f".{os.path.basename(filepath)}.{os.urandom(6).hex()}.tmp")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    fd = os.open(tmp_path, flags, 0o666)
+    if mode is not None:
+        try:
+            if hasattr(os, "fchmod"):
+                os.fchmod(fd, mode)
+            else:
+                os.chmod(tmp_path, mode)
+        except BaseException:
+            os.close(fd)
+            os.remove(tmp_path)
+            raise
+    return fd, tmp_path
+
+
+def _atomic_write(filepath, payload):
+    """Write to a temp file in the same directory, fsync, then rename over filepath"""
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, tmp_path = _open_temp(filepath, directory)
+    try:
+        with os.fdopen(fd, 'wb') as raw:
+            _write_bytes(raw, filepath, payload)
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_dir(directory)
 
 
 def load_json(filepath, default=None, logger=None):
@@ -35,9 +156,9 @@ def load_json(filepath, default=None, logger=None):
         return default
 
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
+        with _open_reader(filepath) as f:
+            return json_backend.loads(f.read())
+    except (ValueError, EOFError, gzip.BadGzipFile) as e:  # Bad JSON/UTF-8 or damaged archive
         msg = f"Invalid JSON in {filepath}: {e}"
         if logger:
             logger.error(msg)
@@ -46,20 +167,463 @@ def load_json(filepath, default=None, logger=None):
         return default
 
 
-def save_json(filepath, data, indent=2):
+def save_json(filepath, data, indent=2, compact=False, atomic=False):
     """
-    Save a dictionary to a JSON file.
+    Save a dictionary to a JSON file. A .gz or .zst extension compresses it.
 
     Args:
         filepath (str): Output path.
         data (dict): JSON-serializable content.
         indent (int): Pretty-print spacing.
+        compact (bool): Write without indentation or spaces (smaller, faster).
+        atomic (bool): Write a temp file, fsync and rename, so a crash never
+            leaves a half-written file behind.
     """
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=indent)
+    payload = json_backend.dumps(data, indent=None if compact else indent)
+    if atomic:
+        _atomic_write(filepath, payload)
+    else:
+        with open(filepath, 'wb') as f:
+            _write_bytes(f, filepath, payload)
     print(f"Saved JSON to: {filepath}")
 
 
+class JsonLinesWriter:
+    def __init__(self, filepath, batch_size=1000, fsync=False):
+        """
+        Buffered JSON Lines appender. Records are serialized as they arrive and
+        written in one call per batch. A .gz or .zst extension compresses each
+        batch as its own member/frame, which standard readers concatenate.
+
+        Args:
+            filepath (str): Output .jsonl path (appended to if it exists)
+            batch_size (int): Records buffered before each write
+            fsync (bool): fsync after every batch for durability
+        """
+        self.filepath = filepath
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self.written = 0
+        self._buffer = []
+        self._file = open(filepath, 'ab')
+
+    def write(self, record):
+        self._buffer.append(json_backend.dumps(record))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        """Write buffered records as one batch"""
+        if not self._buffer:
+            return
+        _write_bytes(self._file, self.filepath, b"\n".join(self._buffer) + b"\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.written += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} path={self.filepath} written={self.written}>"
+
+
+def append_json_lines(filepath, records, batch_size=1000, fsync=False):
+    """
+    Append an iterable of records to a JSON Lines file in batches.
+
+    Returns:
+        int: Number of records written.
+    """
+    with JsonLinesWriter(filepath, batch_size=batch_size, fsync=fsync) as writer:
+        writer.write_many(records)
+    return writer.written
+
+
+def _cut_off(error, buffered):
+    """
+    True if a decode error could just mean the element continues past the
+    buffer: an open string, or a failure within the last few characters
+    (long enough for a partial literal like -Infinity or a unicode escape).
+    """
+    return error.msg.startswith("Unterminated string") or error.pos >= buffered - 16
+
+
+def iter_json_array_stream(chunks, min_read=65536):
+    """
+    Incrementally parse a top-level JSON array from an iterable of byte chunks.
+    Yields one element at a time so memory stays flat regardless of total size.
+
+    Args:
+        chunks (Iterable[bytes]): Raw UTF-8 chunks (e.g. response.iter_content()).
+        min_read (int): Buffer growth target before re-trying a partial element.
+
+    Yields:
+        Any: Each decoded array element.
+
+    Raises:
+        ValueError: If the stream is not a well-formed JSON array.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buf, pos = "", 0
+    exhausted = False
+    started = need_comma = False
+
+    def read_more(target):
+        # Drop consumed text, then read until at least `target` chars are buffered
+        nonlocal buf, pos, exhausted
+        buf, pos = buf[pos:], 0
+        while not exhausted and len(buf) < target:
+            chunk = next(chunks, None)
+            if chunk is None:
+                exhausted = True
+                buf += text_decoder.decode(b"", final=True)
+            else:
+                buf += text_decoder.decode(chunk)
+
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n":
+            pos += 1
+        if pos >= len(buf):
+            if exhausted:
+                raise ValueError("Unexpected end of JSON array")
+            read_more(min_read)
+            continue
+
+        char = buf[pos]
+        if not started:
+            if char != "[":
+                raise ValueError("Expected a top-level JSON array")
+            started = True
+            pos += 1
+        elif char == "]":
+            return
+        elif need_comma:
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+            need_comma = False
+            pos += 1
+        else:
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as e:
+                if exhausted or not _cut_off(e, len(buf)):
+                    raise  # Malformed element: fail now instead of buffering the rest of the stream
+                read_more(max(min_read, 2 * (len(buf) - pos)))
+                continue
+            if not exhausted and not buf[end:].lstrip("0123456789.eE+-"):
+                # A number may continue in the next chunk (e.g. "-0" then ".5")
+                read_more(len(buf) - pos + min_read)
+                continue
+            pos = end
+            need_comma = True
+            yield item
+
+
+# ========== Large Files ==========
+def _report(logger, level, msg):
+    if logger:
+        getattr(logger, level)(msg)
+    else:
+        print(f"[{'WARN' if level == 'warning' else level.upper()}] {msg}")
+
+
+def _open_mmap(f):
+    """Read-only mmap of an open file, or None for an empty file"""
+    try:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        return None
+
+
+def _iter_lines(filepath):
+    """Yield raw lines: mmap for plain files, buffered decompression otherwise"""
+    if _compression_for(filepath):
+        with _open_reader(filepath) as f:
+            pending = b""
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                yield from lines
+            if pending:
+                yield pending
+        return
+    with open(filepath, 'rb') as f:
+        mm = _open_mmap(f)
+        if mm is None:
+            return
+        with mm:
+            yield from iter(mm.readline, b"")
+
+
+def iter_json_lines(filepath, skip_invalid=True, logger=None):
+    """
+    Yield one record per line of a JSON Lines file via a memory map
+    (or a decompressing stream for .gz/.zst). Blank lines are ignored; malformed lines are reported and skipped.
+
+    Args:
+        filepath (str): Path to the .jsonl file.
+        skip_invalid (bool): If False, raise on the first malformed line.
+        logger (Logger): Optional logger for malformed-line reports.
+
+    Raises:
+        ValueError: On a malformed line when skip_invalid is False.
+    """
+    skipped = 0
+    for line_no, line in enumerate(_iter_lines(filepath), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json_backend.loads(line)
+        except ValueError as e:
+            msg = f"Invalid JSON on line {line_no} of {filepath}: {e}"
+            if not skip_invalid:
+                raise ValueError(msg) from e
+            skipped += 1
+            _report(logger, "error", msg)
+            continue
+        yield record
+
+    if skipped:
+        _report(logger, "warning", f"Skipped {skipped} malformed line(s) in {filepath}")
+
+
+def iter_json_array(filepath, chunk_size=1 << 20):
+    """
+    Yield the elements of a file holding one large top-level JSON array,
+    reading it through a memory map (or a decompressing stream for .gz/.zst)
+    in chunk_size slices.
+
+    Raises:
+        ValueError: If the file is not a well-formed JSON array (an array
+            has no line boundaries to resync on, so errors are not skipped).
+    """
+    if _compression_for(filepath):
+        with _open_reader(filepath) as f:
+            yield from iter_json_array_stream(iter(lambda: f.read(chunk_size), b""), min_read=chunk_size)
+        return
+
+    with open(filepath, 'rb') as f:
+        mm = _open_mmap(f)
+        if mm is None:
+            raise ValueError(f"Empty file, expected a JSON array: {filepath}")
+        with mm:
+            chunks = (mm[i:i + chunk_size] for i in range(0, len(mm), chunk_size))
+            yield from iter_json_array_stream(chunks, min_read=chunk_size)
+
+
+def build_line_index(filepath, index_path=None):
+    """
+    Record the byte offset of every non-blank line so record N can be read
+    without rescanning. Optionally save it (8 bytes per record) to index_path.
+
+    Returns:
+        array: Unsigned 64-bit offsets; record N starts at index[N].
+
+    Raises:
+        ValueError: For compressed files (offsets need an uncompressed file).
+    """
+    if _compression_for(filepath):
+        raise ValueError(f"Cannot index a compressed file: {filepath}")
+    index = array('Q')
+    with open(filepath, 'rb') as f:
+        mm = _open_mmap(f)
+        if mm is not None:
+            with mm:
+                pos, size = 0, len(mm)
+                while pos < size:
+                    end = mm.find(b"\n", pos)
+                    end = size if end == -1 else end
+                    if mm[pos:end].strip():
+                        index.append(pos)
+                    pos = end + 1
+
+    if index_path:
+        with open(index_path, 'wb') as f:
+            index.tofile(f)
+    return index
+
+
+def load_line_index(index_path):
+    """Load an index saved by build_line_index()"""
+    index = array('Q')
+    with open(index_path, 'rb') as f:
+        index.frombytes(f.read())
+    return index
+
+
+def read_json_line(filepath, n, index):
+    """
+    Read record N (the Nth non-blank line, 0-based) using a line index.
+
+    Raises:
+        IndexError: If N is out of range.
+        ValueError: If that line is not valid JSON.
+    """
+    with open(filepath, 'rb') as f:
+        f.seek(index[n])
+        return json_backend.loads(f.readline())
+
+
+# ========== Cached Loading ==========
+def freeze(data):
+    """Return a read-only deep view: dicts become MappingProxyType, lists tuples"""
+    if isinstance(data, dict):
+        return MappingProxyType({key: freeze(value) for key, value in data.items()})
+    if isinstance(data, list):
+        return tuple(freeze(value) for value in data)
+    return data
+
+
+class JsonFileCache:
+    def __init__(self, max_entries=128, frozen=False, logger=None):
+        """
+        Caches parsed JSON files keyed on path + (mtime, size, inode), so
+        re-reading an unchanged file costs one stat() call.
+
+        Args:
+            max_entries (int): Max cached files (least recently used go first)
+            frozen (bool): Return read-only views (see freeze()). Otherwise
+                every caller shares the same object and must not mutate it.
+            logger (Logger): Optional logger passed through to load_json()
+        """
+        self.max_entries = max_entries
+        self.frozen = frozen
+        self.logger = logger
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+
+    @staticmethod
+    def _signature(path):
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def load(self, filepath, default=None):
+        """
+        Return the parsed file, re-reading it only if it changed. While the
+        watcher runs, the stat() is skipped and changes are picked up by the
+        watcher within its interval. Missing/invalid files return default and
+        are not cached.
+        """
+        path = os.path.abspath(filepath)
+        watching = self._watcher is not None
+
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None:
+            try:
+                if watching or self._signature(path) == entry[0]:
+                    with self._lock:
+                        self.hits += 1
+                        if path in self._entries:
+                            self._entries.move_to_end(path)
+                    return entry[1]
+            except OSError:
+                pass
+
+        with self._lock:
+            self.misses += 1
+        try:
+            signature = self._signature(path)
+        except OSError:
+            self.invalidate(path)
+            return load_json(filepath, default=default, logger=self.logger)
+
+        missing = object()
+        data = load_json(filepath, default=missing, logger=self.logger)
+        if data is missing:
+            self.invalidate(path)
+            return default
+        if self.frozen:
+            data = freeze(data)
+
+        with self._lock:
+            self._entries[path] = (signature, data)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+    def invalidate(self, filepath=None):
+        """Forget one file, or everything when filepath is None"""
+        with self._lock:
+            if filepath is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(filepath), None)
+
+    # ========== Background Watcher ==========
+    def start_watcher(self, interval=1.0):
+        """Poll cached files every `interval` seconds and drop changed ones"""
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval,), name="JsonFileCacheWatcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watcher(self):
+        if self._watcher is None:
+            return
+        self._stop.set()
+        self._watcher.join()
+        self._watcher = None
+
+    def _watch(self, interval):
+        while not self._stop.wait(interval):
+            with self._lock:
+                snapshot = [(path, entry[0]) for path, entry in self._entries.items()]
+            for path, signature in snapshot:
+                try:
+                    changed = self._signature(path) != signature
+                except OSError:
+                    changed = True
+                if changed:
+                    logging.debug(f"Config changed, dropping cached copy: {path}")
+                    with self._lock:
+                        entry = self._entries.get(path)
+                        if entry is not None and entry[0] == signature:
+                            del self._entries[path]
+
+    def stats(self):
+        """Return hit/miss counters as a dictionary"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} entries={len(self._entries)} max={self.max_entries}>"
+
+
+_default_cache = JsonFileCache()
+
+
+def load_json_cached(filepath, default=None):
+    """load_json() through a shared JsonFileCache: unchanged files are not re-parsed"""
+    return _default_cache.load(filepath, default=default)
+
+
 # === Example ===
 if __name__ == "__main__":
     test_file = "config.json"
@@ -70,3 +634,21 @@ if __name__ == "__main__":
 
     # Save it back for testing
     save_json("config_saved.json", config)
+
+    # Stream a JSON Lines file and jump straight to record 2
+    with open("events.jsonl", "w", encoding="utf-8") as f:
+        f.write('{"id": 0}\n{"id": 1}\nnot json\n{"id": 3}\n')
+    print(list(iter_json_lines("events.jsonl")))
+    index = build_line_index("events.jsonl", index_path="events.jsonl.idx")
+    print(read_json_line("events.jsonl", 3, index))
+
+    # Compact, gzip-compressed snapshot that survives a crash mid-write
+    save_json("state.json.gz", {"events": list(range(1000))}, compact=True, atomic=True)
+    print(len(load_json("state.json.gz")["events"]))
+
+    # Per-loop config reads only cost a stat() while the file is unchanged
+    for _ in range(3):
+        config = load_json_cached("config_saved.json", default=fallback)
+
+    # Batched bulk append
+    append_json_lines("events.jsonl", ({"id": i} for i in range(4, 10_000)), batch_size=500)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+rate_limiter.py
+Author: Jeremy Tarkington
+
+Client-side token-bucket rate limiter for outbound API calls with:
+- Configurable rate (tokens/sec) and burst size
+- Per-key buckets (e.g. per host or per API key) with optional overrides
+- Blocking sync acquire() and non-blocking async acquire_async()
+- Retry-After handling that pauses a bucket after 429/503 responses
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+class RateLimitTimeout(RuntimeError):
+    """Raised when acquire() cannot get a token within its timeout"""
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=None):
+        """
+        Args:
+            rate (float): Tokens added per second (sustained requests/sec)
+            burst (int): Bucket capacity (default: max(1, rate))
+        """
+        self.rate = rate
+        self.capacity = burst or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens=1):
+        """
+        Take tokens if available. Returns 0.0 on success, else seconds to wait.
+
+        Raises:
+            ValueError: If more tokens are asked for than the bucket can ever hold.
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot take {tokens} tokens from a bucket of capacity {self.capacity}")
+        with self._lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+
+            elapsed = max(0.0, now - self.updated)
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens - self.tokens) / self.rate
+
+    def pause(self, seconds):
+        """Hand out no tokens for `seconds`, then refill from empty"""
+        with self._lock:
+            resume_at = time.monotonic() + seconds
+            if resume_at > self.paused_until:
+                self.paused_until = resume_at
+                self.tokens = 0.0
+                self.updated = resume_at
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} rate={self.rate}/s burst={self.capacity}>"
+
+
+def parse_retry_after(value):
+    """Convert a Retry-After header (seconds or HTTP date) to seconds, or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    def __init__(self, rate=5.0, burst=None, limits=None):
+        """
+        Args:
+            rate (float): Default tokens/sec for each key
+            burst (int): Default bucket capacity for each key
+            limits (dict): Per-key overrides, key -> (rate, burst)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.limits = limits or {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, key="default"):
+        """Return the bucket for a key, creating it on first use"""
+        with self._lock:
+            if key not in self._buckets:
+                rate, burst = self.limits.get(key, (self.rate, self.burst))
+                self._buckets[key] = TokenBucket(rate, burst)
+            return self._buckets[key]
+
+    def acquire(self, key="default", tokens=1, timeout=None):
+        """
+        Block until a token is available for `key`.
+
+        Raises:
+            RateLimitTimeout: If timeout (seconds) passes without a token.
+            ValueError: If tokens exceeds the key's burst capacity.
+        """
+        bucket = self.bucket(key)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = bucket.try_acquire(tokens)
+            if wait <= 0:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise RateLimitTimeout(f"No rate-limit token for '{key}' within {timeout}s")
+            time.sleep(wait)
+
+    async def acquire_async(self, key="default", tokens=1):
+        """Wait for a token for `key` without blocking the event loop (ValueError if tokens > burst)"""
+        bucket = self.bucket(key)
+        while True:
+            wait = bucket.try_acquire(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def pause(self, key, seconds):
+        """Stop handing out tokens for `key` for `seconds`"""
+        logging.warning(f"Rate limit hit for '{key}', pausing {seconds:.1f}s")
+        self.bucket(key).pause(seconds)
+
+    def update_from_response(self, key, response):
+        """
+        Pause the bucket when a 429/503 response carries Retry-After.
+        Returns the pause length in seconds, or None if nothing was paused.
+        """
+        if response.status_code not in (429, 503):
+            return None
+        seconds = parse_retry_after(response.headers.get("Retry-After"))
+        if seconds is None:
+            return None
+        self.pause(key, seconds)
+        return seconds
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} rate={self.rate}/s keys={len(self._buckets)}>"
+
+
+# === Example ===
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    limiter = RateLimiter(rate=5, burst=2, limits={"slow-host": (1, 1)})
+
+    start = time.monotonic()
+    for i in range(6):
+        limiter.acquire("fast-host")
+        print(f"fast-host call {i} at {time.monotonic() - start:.2f}s")
+
+    async def async_calls():
+        for i in range(3):
+            await limiter.acquire_async("slow-host")
+            print(f"slow-host call {i} at {time.monotonic() - start:.2f}s")
+
+    asyncio.run(async_calls())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+response_cache.py
+Author: Jeremy Tarkington
+
+Opt-in HTTP response cache for ApiClient / call_api with:
+- In-memory LRU with entry-count and byte-size limits
+- Per-endpoint TTLs (longest matching endpoint prefix wins)
+- Separate entries per credential (Authorization / Cookie are part of the key)
+- Optional on-disk persistence (one JSON file per entry)
+- ETag / Last-Modified revalidation (304 reuses the cached parsed body)
+- Hit / miss / revalidation counters
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        default_ttl=60,
+        ttls=None,
+        max_entries=1000,
+        max_bytes=50_000_000,
+        persist_dir=None,
+        vary_headers=("Authorization", "Cookie")
+    ):
+        """
+        Args:
+            default_ttl (float): Seconds a response stays fresh
+            ttls (dict): Endpoint prefix -> TTL override, e.g. {"/users": 300}
+            max_entries (int): Max number of cached responses
+            max_bytes (int): Max total size of cached response bodies
+            persist_dir (str): Optional directory to persist entries across runs
+            vary_headers (tuple): Request headers whose values are part of the
+                cache key, so one caller never sees another's response
+        """
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.persist_dir = persist_dir
+        self.vary_headers = tuple(name.lower() for name in vary_headers)
+
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+        if self.persist_dir:
+            os.makedirs(self.persist_dir, exist_ok=True)
+
+    # ========== Lookup ==========
+    def key_for(self, url, headers=None):
+        """Cache key: the full URL, plus a digest of any vary_headers sent with it"""
+        sent = {name.lower(): value for name, value in (headers or {}).items()}
+        varied = [(name, sent[name]) for name in self.vary_headers if name in sent]
+        if not varied:
+            return url
+        digest = hashlib.sha256(repr(varied).encode("utf-8")).hexdigest()[:16]  # No raw credentials in keys
+        return f"{url}#vary={digest}"
+
+    def lookup(self, key):
+        """
+        Return (entry, fresh). entry is None when nothing is cached.
+        A stale entry is still returned so its validators can be sent.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._load_from_disk(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+            fresh = entry is not None and entry["expires_at"] > time.time()
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return entry, fresh
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Build If-None-Match / If-Modified-Since headers for a stale entry"""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    # ========== Update ==========
+    def store(self, key, endpoint, response, data):
+        """Cache a parsed response body unless the server said no-store"""
+        if "no-store" in response.headers.get("Cache-Control", ""):
+            return
+
+        entry = {
+            "endpoint": endpoint,
+            "data": data,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "expires_at": time.time() + self.ttl_for(endpoint),
+            "size": len(response.content),
+        }
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._total_bytes += entry["size"]
+            self._save_to_disk(key, entry)
+            self._evict()
+
+    def revalidated(self, key, entry, response):
+        """Handle a 304: extend freshness and return the cached parsed body"""
+        with self._lock:
+            self.revalidations += 1
+            entry["expires_at"] = time.time() + self.ttl_for(entry["endpoint"])
+            entry["etag"] = response.headers.get("ETag", entry.get("etag"))
+            entry["last_modified"] = response.headers.get("Last-Modified", entry.get("last_modified"))
+            self._save_to_disk(key, entry)
+        return entry["data"]
+
+    def ttl_for(self, endpoint):
+        """Return the TTL of the longest configured prefix matching endpoint"""
+        matches = [prefix for prefix in self.ttls if endpoint.startswith(prefix)]
+        if not matches:
+            return self.default_ttl
+        return self.ttls[max(matches, key=len)]
+
+    def clear(self):
+        """Drop every cached entry (memory and disk)"""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def stats(self):
+        """Return cache counters as a dictionary"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    # ========== Internals (call with lock held) ==========
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry["size"]
+        if self.persist_dir:
+            path = self._disk_path(key)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _disk_path(self, key):
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.persist_dir, f"{digest}.json")
+
+    def _save_to_disk(self, key, entry):
+        if not self.persist_dir:
+            return
+        try:
+            with open(self._disk_path(key), "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+        except (OSError, TypeError) as e:
+            logging.warning(f"Could not persist cache entry: {e}")
+
+    def _load_from_disk(self, key):
+        if not self.persist_dir:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logging.warning(f"Discarding unreadable cache entry {path}: {e}")
+            os.remove(path)
+            return None
+
+        self._entries[key] = entry
+        self._total_bytes += entry["size"]
+        self._evict()
+        return self._entries.get(key)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} entries={len(self._entries)} bytes={self._total_bytes}>"
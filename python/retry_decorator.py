@@ -8,22 +8,186 @@ Supports:
 - Retry limit
 - Delay between retries
 - Optional exception types to catch
+- Full or decorrelated jitter to avoid synchronized retry storms
+- Shared retry budget (caps retries as a fraction of calls)
+- Circuit breaker shared by dependency name (fails fast while unhealthy)
+- Sync and async (coroutine) functions; async retries use asyncio.sleep
 """
 
+import asyncio
 import time
+import random
 import functools
 import logging
+import threading
+from collections import deque
 
 
+# ========== Backoff ==========
+def compute_delay(attempt, delay, backoff=False, jitter=None, max_delay=None, previous=None):
+    """
+    Return how long to sleep before the next attempt.
+
+    Args:
+        attempt (int): Number of failed attempts so far (1-based)
+        delay (float): Base delay in seconds
+        backoff (bool): If True, doubles the base delay each retry
+        jitter (str): None, "full" (uniform 0..delay) or "decorrelated"
+            (uniform delay..previous*3, AWS style)
+        max_delay (float): Optional cap on the returned delay
+        previous (float): Last delay returned (used by "decorrelated")
+    """
+    if jitter == "decorrelated":
+        value = random.uniform(delay, (previous or delay) * 3)
+    else:
+        value = delay * (2 ** (attempt - 1)) if backoff else delay
+        if jitter == "full":
+            value = random.uniform(0, value)
+        elif jitter is not None:
+            raise ValueError(f"Unknown jitter mode: {jitter}")
+    return min(value, max_delay) if max_delay is not None else value
+
+
+# ========== Retry Budget ==========
+class RetryBudget:
+    def __init__(self, ratio=0.1, min_retries=10, window=10.0):
+        """
+        Caps retries to a fraction of calls over a sliding time window.
+        Share one instance between callables to give them a common budget.
+
+        Args:
+            ratio (float): Allowed retries per call (0.1 = 10% extra load)
+            min_retries (int): Retries always allowed per window (low traffic)
+            window (float): Sliding window length in seconds
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._calls = deque()
+        self._retries = deque()
+        self._lock = threading.Lock()
+
+    def _trim(self, now):
+        cutoff = now - self.window
+        for events in (self._calls, self._retries):
+            while events and events[0] < cutoff:
+                events.popleft()
+
+    def record_call(self):
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            self._calls.append(now)
+
+    def try_acquire_retry(self):
+        """Return True (and count the retry) if the budget allows another retry"""
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            allowed = max(self.min_retries, self.ratio * len(self._calls))
+            if len(self._retries) >= allowed:
+                return False
+            self._retries.append(now)
+            return True
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} ratio={self.ratio} window={self.window}s>"
+
+
+# ========== Circuit Breaker ==========
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose circuit is open"""
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name="default", failure_threshold=5, reset_timeout=30.0):
+        """
+        Args:
+            name (str): Dependency name (for logs)
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds to stay open before a trial call
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Return True if a call may go through right now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and (
+                not self._trial_in_flight
+                or time.monotonic() - self._trial_started >= self.reset_timeout  # Trial never reported back
+            ):
+                self._trial_in_flight = True
+                self._trial_started = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logging.warning(f"Circuit '{self.name}' opened after {self.failures} failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} name={self.name} state={self.state}>"
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name, failure_threshold=5, reset_timeout=30.0):
+    """
+    Return the shared CircuitBreaker for a dependency name, creating it on
+    first use. Settings only apply when the breaker is first created.
+    """
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, failure_threshold, reset_timeout)
+        return _breakers[name]
+
+
+# ========== Decorator ==========
 def retry(
     max_attempts=3,
     delay=2,
     exceptions=(Exception,),
     backoff=False,
-    logger=None
+    logger=None,
+    jitter=None,
+    max_delay=None,
+    budget=None,
+    circuit=None
 ):
     """
-    Decorator that retries a function on failure.
+    Decorator that retries a function on failure. Coroutine functions are
+    retried with asyncio.sleep, and cancellation is never retried.
 
     Args:
         max_attempts (int): Total number of attempts (default 3)
@@ -31,31 +195,83 @@ def retry(
         exceptions (tuple): Exception types to catch (default Exception)
         backoff (bool): If True, doubles delay each retry
         logger (Logger): Optional logger (else prints)
+        jitter (str): None, "full" or "decorrelated" randomized delays
+        max_delay (float): Optional cap on any single delay
+        budget (RetryBudget): Optional shared budget; retries stop when spent
+        circuit (str | CircuitBreaker): Dependency name (shared breaker) or
+            breaker instance; raises CircuitOpenError while the circuit is open
 
     Example:
-        @retry(max_attempts=5, delay=1)
+        @retry(max_attempts=5, delay=1, backoff=True, jitter="full", circuit="billing-api")
         def fragile_function():
             ...
     """
+    breaker = get_circuit_breaker(circuit) if isinstance(circuit, str) else circuit
+
+    def log(msg):
+        if logger:
+            logger.warning(msg)
+        else:
+            print(msg)
+
+    def check_circuit(func):
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(f"{func.__name__} skipped: circuit '{breaker.name}' is open.")
+
+    def on_success():
+        if breaker is not None:
+            breaker.record_success()
+
+    def on_failure(func, e, tries, current_delay):
+        """Record a failed attempt; return the delay before the next one, or None if out of attempts"""
+        if breaker is not None:
+            breaker.record_failure()
+        log(f"[Retry {tries}/{max_attempts}] {func.__name__} failed: {e}")
+        if tries >= max_attempts:
+            return None
+        if budget is not None and not budget.try_acquire_retry():
+            raise RuntimeError(f"{func.__name__} failed: retry budget exhausted.") from e
+        return compute_delay(tries, delay, backoff, jitter, max_delay, current_delay)
+
     def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if budget is not None:
+                    budget.record_call()
+                current_delay = None
+                for tries in range(1, max_attempts + 1):
+                    check_circuit(func)
+                    try:
+                        result = await func(*args, **kwargs)
+                    except asyncio.CancelledError:
+                        raise  # Never retry a cancelled task
+                    except exceptions as e:
+                        current_delay = on_failure(func, e, tries, current_delay)
+                        if current_delay is not None:
+                            await asyncio.sleep(current_delay)
+                    else:
+                        on_success()
+                        return result
+                raise RuntimeError(f"{func.__name__} failed after {max_attempts} attempts.")
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            tries = 0
-            current_delay = delay
-            while tries < max_attempts:
+            if budget is not None:
+                budget.record_call()
+            current_delay = None
+            for tries in range(1, max_attempts + 1):
+                check_circuit(func)
                 try:
-                    return func(*args, **kwargs)
+                    result = func(*args, **kwargs)
                 except exceptions as e:
-                    tries += 1
-                    msg = f"[Retry {tries}/{max_attempts}] {func.__name__} failed: {e}"
-                    if logger:
-                        logger.warning(msg)
-                    else:
-                        print(msg)
-                    if tries < max_attempts:
+                    current_delay = on_failure(func, e, tries, current_delay)
+                    if current_delay is not None:
                         time.sleep(current_delay)
-                        if backoff:
-                            current_delay *= 2
+                else:
+                    on_success()
+                    return result
             raise RuntimeError(f"{func.__name__} failed after {max_attempts} attempts.")
         return wrapper
     return decorator
@@ -66,8 +282,6 @@ if __name__ == "__main__":
     log = logging.getLogger("retry_example")
     logging.basicConfig(level=logging.INFO)
 
-    import random
-
     @retry(max_attempts=4, delay=1, backoff=True, logger=log)
     def unstable():
         if random.random() < 0.75:
@@ -75,3 +289,26 @@ if __name__ == "__main__":
         return "Success!"
 
     print(unstable())
+
+    # Jittered retries with a shared budget and a breaker named after the dependency
+    shared_budget = RetryBudget(ratio=0.2)
+
+    @retry(max_attempts=3, delay=0.2, jitter="decorrelated", max_delay=2,
+           budget=shared_budget, circuit="flaky-service", logger=log)
+    def call_flaky_service():
+        raise ConnectionError("flaky-service unavailable")
+
+    for _ in range(3):
+        try:
+            call_flaky_service()
+        except RuntimeError as e:
+            log.error(e)
+
+    # Coroutines are retried without blocking the event loop
+    @retry(max_attempts=3, delay=0.5, jitter="full", logger=log)
+    async def unstable_async():
+        if random.random() < 0.5:
+            raise ValueError("Random async failure occurred!")
+        return "Async success!"
+
+    print(asyncio.run(unstable_async()))
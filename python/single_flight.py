@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+single_flight.py
+Author: Jeremy Tarkington
+
+In-flight request coalescing ("single-flight") with:
+- One real call per key while it is in flight; concurrent callers share it
+- Results and exceptions delivered to every waiting caller
+- Configurable dedup key (default: method + full URL with query params + credentials)
+- Counters for executed vs. shared calls
+"""
+
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future
+from urllib.parse import urlencode
+
+
+VARY_HEADERS = ("authorization", "cookie")
+
+
+def default_key(method, url, params=None, headers=None):
+    """
+    Dedup on method + URL + sorted params + a digest of the Authorization and
+    Cookie headers, so callers with different credentials never share a result.
+    """
+    query = urlencode(sorted((params or {}).items()), doseq=True)
+    sent = {name.lower(): value for name, value in (headers or {}).items()}
+    varied = [(name, sent[name]) for name in VARY_HEADERS if name in sent]
+    if not varied:
+        return (method.upper(), url, query)
+    digest = hashlib.sha256(repr(varied).encode("utf-8")).hexdigest()[:16]  # No raw credentials in keys
+    return (method.upper(), url, query, digest)
+
+
+class SingleFlight:
+    def __init__(self, key_func=None):
+        """
+        Args:
+            key_func (callable): (method, url, params, headers) -> hashable key.
+                The default varies on Authorization and Cookie; add any other
+                header that changes the response per caller.
+        """
+        self.key_func = key_func or default_key
+        self.executed = 0
+        self.shared = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def key_for(self, method, url, params=None, headers=None):
+        return self.key_func(method, url, params, headers)
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) unless a call with the same key is already in
+        flight, in which case wait for and return that call's result (or
+        re-raise its exception). Callers receive the same result object.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            logging.debug(f"Joining in-flight call: {key}")
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key)
+            future.set_exception(e)
+            raise
+        self._finish(key)
+        future.set_result(result)
+        return result
+
+    def _finish(self, key):
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def stats(self):
+        """Return executed/shared counters as a dictionary"""
+        with self._lock:
+            return {"executed": self.executed, "shared": self.shared, "in_flight": len(self._calls)}
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} in_flight={len(self._calls)}>"
+
+
+# === Example ===
+if __name__ == "__main__":
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    flight = SingleFlight()
+
+    def slow_lookup():
+        time.sleep(0.5)
+        return {"config": "value"}
+
+    key = flight.key_for("GET", "https://example.com/config")
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        results = list(pool.map(lambda _: flight.do(key, slow_lookup), range(10)))
+
+    print(results[0], flight.stats())  # executed=1, shared=9